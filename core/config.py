@@ -1,6 +1,7 @@
-import os,sys
+import os
+import importlib.util
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from sqlmodel import create_engine, Session, select
 from sqlmodel import text
 from .models import ScriptSyncMenu,ScriptSyncSchedule
@@ -37,6 +38,9 @@ class Config:
         self._log_dir = f"{self._base_dir}/logs"
         self._data_dir = f"{self._base_dir}/data"
 
+        # Menu.json 转换函数，首次使用时加载
+        self._menu_converter: Optional[Callable[[str], Any]] = None
+
     @property
     def db_host(self) -> str:
         """数据库主机地址"""
@@ -103,7 +107,7 @@ class Config:
         return True
 
 
-    def get_table_data(self, script_name: str,condtion:Dict[str,Any] = None,limit:int = None) -> Optional[List[Dict[str, Any]]]:
+    def get_table_data(self, script_name: str,condtion:Dict[str,Any] = None,limit:int = None, as_tuples: bool = False) -> Optional[List[Any]]:
         """
         根据脚本名称获取对应的数据表
         
@@ -111,9 +115,11 @@ class Config:
             script_name (str): 脚本名称
             condtion (Dict[str,Any], optional): 查询条件，默认 None
             limit (int, optional): 限制返回数据条数，默认 None（返回全部数据）
+            as_tuples (bool, optional): 是否直接返回 Row 对象（类似具名元组，按属性访问列），
+                不为每行构造字典，默认 False
             
         Returns:
-            Optional[List[Dict[str, Any]]]: 包含表数据的列表，若不存在则返回 None
+            Optional[List[Any]]: 包含表数据的列表（字典或 Row 对象），若不存在则返回 None
         """
         # 定义脚本与数据表的映射关系
         # 直接以 script_name 作为表名，无需映射
@@ -144,6 +150,8 @@ class Config:
                     text(f"SELECT * FROM {table_name}{where_clause}{limit_clause}"),
                     condtion
                 )
+            if as_tuples:
+                return result.all() if result else None
             # result 是 Row 对象列表，需转成 dict 列表
             # 在 SQLAlchemy 2.0 中，Row 对象需要使用 _asdict() 方法转换为字典
             return [row._asdict() for row in result] if result else None
@@ -256,6 +264,34 @@ class Config:
         # 创建数据目录
         os.makedirs(self._data_dir, exist_ok=True)
 
+    def _load_menu_converter(self) -> Callable[[str], Any]:
+        """
+        按文件路径加载 tools/sys/menu2script_schedule.py 中的转换函数
+        首次加载后缓存函数引用，不修改 sys.path
+
+        Returns:
+            Callable[[str], Any]: convert_menu_to_script_schedule 函数
+        """
+        if self._menu_converter is not None:
+            return self._menu_converter
+
+        tool_file = os.path.join(self._base_dir, "tools", "sys", "menu2script_schedule.py")
+        if not os.path.exists(tool_file):
+            raise FileNotFoundError(f"工具文件不存在: {tool_file}")
+
+        try:
+            spec = importlib.util.spec_from_file_location("menu2script_schedule", tool_file)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"无法加载工具规范: {tool_file}")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            raise ImportError(f"无法导入 menu2script_schedule 工具: {str(e)}")
+
+        self._menu_converter = module.convert_menu_to_script_schedule
+        print("成功导入转换工具函数")
+        return self._menu_converter
+
     def convert_menu(self, menu_path: str = None) -> Dict[str, Any]:
         """
         将 Menu.json 转换为脚本调度配置并更新数据库
@@ -286,20 +322,7 @@ class Config:
             print(f"开始转换 Menu.json: {menu_path}")
 
             # 2. 导入工具模块并调用转换函数
-            tools_dir = os.path.join(config.base_dir, "tools", "sys")
-            if not os.path.exists(tools_dir):
-                raise FileNotFoundError(f"工具目录不存在: {tools_dir}")
-
-            # 添加工具目录到 Python 路径
-            if tools_dir not in sys.path:
-                sys.path.insert(0, tools_dir)
-
-            try:
-                from menu2script_schedule import convert_menu_to_script_schedule
-
-                print("成功导入转换工具函数")
-            except ImportError as e:
-                raise ImportError(f"无法导入 menu2script_schedule 工具: {str(e)}")
+            convert_menu_to_script_schedule = self._load_menu_converter()
 
             # 3. 执行转换
             schedule_df = convert_menu_to_script_schedule(menu_path)
@@ -315,23 +338,30 @@ class Config:
             engine = engines["engine"]
 
             with Session(engine) as session:
-                for _, row in schedule_df.iterrows():
+                # 一次性查询出所有已存在的菜单和调度记录，避免逐条查询
+                names = schedule_df["name"].tolist()
+                existing_menus = {
+                    menu.name: menu
+                    for menu in session.query(ScriptSyncMenu)
+                    .filter(ScriptSyncMenu.name.in_(names))
+                    .all()
+                }
+                existing_schedules = {
+                    schedule.name: schedule
+                    for schedule in session.query(ScriptSyncSchedule)
+                    .filter(ScriptSyncSchedule.name.in_(names))
+                    .all()
+                }
+                new_menus: Dict[str, Dict[str, Any]] = {}
+                new_schedules: Dict[str, Dict[str, Any]] = {}
+
+                # to_dict("records") 得到普通字典，避免 iterrows 逐行构造 Series 的开销
+                for row in schedule_df.to_dict(orient="records"):
                     script_name = row["name"]
                     print(f"处理脚本: {script_name}")
 
-                    # 检查 ScriptSyncMenu 是否已存在
-                    existing_menu = (
-                        session.query(ScriptSyncMenu)
-                        .filter(ScriptSyncMenu.name == script_name)
-                        .first()
-                    )
-
-                    # 检查 ScriptSyncSchedule 是否已存在
-                    existing_schedule = (
-                        session.query(ScriptSyncSchedule)
-                        .filter(ScriptSyncSchedule.name == script_name)
-                        .first()
-                    )
+                    existing_menu = existing_menus.get(script_name)
+                    existing_schedule = existing_schedules.get(script_name)
 
                     schedule = row.get("schedule")
 
@@ -346,8 +376,8 @@ class Config:
                         existing_menu.is_error_stop = row.get("is_error_stop", False)
                         existing_menu.save_to_db = row.get("save_to_db", False)
                         existing_menu.interval = row.get("interval", "")
+                        # 配置未变化时 onupdate 不会触发，显式刷新更新时间
                         existing_menu.updated_at = datetime.now()
-                        session.add(existing_menu)
 
                         # 更新 ScriptSyncSchedule
                         existing_schedule.period = schedule.get("period", "")
@@ -361,7 +391,6 @@ class Config:
                         if original_last_sync is None and schedule.get("last_sync_datetime"):
                             existing_schedule.last_sync_datetime = schedule.get("last_sync_datetime")
 
-                        session.add(existing_schedule)
                         result["updated_items"] += 1
 
                         detail = {
@@ -378,43 +407,54 @@ class Config:
 
                     else:
                         # 创建新记录 - 同时创建 ScriptSyncMenu 和 ScriptSyncSchedule
-                        new_menu = ScriptSyncMenu(
-                            name=script_name,
-                            cn_name=row.get("cn_name", ""),
-                            desc=row.get("desc", ""),
-                            type=row.get("type", ""),
-                            is_error_stop=row.get("is_error_stop", False),
-                            save_to_db=row.get("save_to_db", False),
-                            interval=row.get("interval", "1"),
-                            remark=f"自动创建",
-                        )
-                        session.add(new_menu)
-
-                        new_schedule = ScriptSyncSchedule(
-                            name=script_name,
-                            period=schedule.get("period", ""),
-                            func_name=schedule.get("func_name", ""),
-                            turn_on=schedule.get("turn_on", False),
-                            last_sync_datetime=None,  # 新记录没有最后同步时间
-                            start_time=schedule.get("start_time", None),
-                            end_time=schedule.get("end_time", None),
-                            step=schedule.get("step", ""),
-                            immediate=schedule.get("immediate", False),
-                        )
-                        session.add(new_schedule)
-                        result["created_items"] += 1
+                        # 新记录直接以字典形式批量插入，不构造 ORM 对象
+                        new_menu = {
+                            "name": script_name,
+                            "cn_name": row.get("cn_name", ""),
+                            "desc": row.get("desc", ""),
+                            "type": row.get("type", ""),
+                            "is_error_stop": row.get("is_error_stop", False),
+                            "save_to_db": row.get("save_to_db", False),
+                            "interval": row.get("interval", "1"),
+                            "meta": None,
+                            "updated_at": datetime.now(),
+                        }
+
+                        new_schedule = {
+                            "name": script_name,
+                            "period": schedule.get("period", ""),
+                            "turn_on": schedule.get("turn_on", False),
+                            "last_sync_datetime": None,  # 新记录没有最后同步时间
+                            "start_time": schedule.get("start_time", None),
+                            "end_time": schedule.get("end_time", None),
+                            "step": schedule.get("step", ""),
+                            "immediate": schedule.get("immediate", False),
+                        }
+
+                        if script_name in new_menus:
+                            # Menu.json 中重复出现的新脚本，以后出现的配置为准
+                            action = "updated"
+                            result["updated_items"] += 1
+                        else:
+                            action = "created"
+                            result["created_items"] += 1
+                        new_menus[script_name] = new_menu
+                        new_schedules[script_name] = new_schedule
 
                         detail = {
                             "script_name": script_name,
-                            "action": "created",
-                            "period": new_schedule.period,
-                            "turn_on": new_schedule.turn_on,
+                            "action": action,
+                            "period": new_schedule["period"],
+                            "turn_on": new_schedule["turn_on"],
                         }
                         result["details"].append(detail)
 
                         print(f"创建新脚本调度: {script_name}")
 
-                # 提交事务
+                # 新记录通过一条多行 INSERT 写入，已有记录的修改由会话跟踪，统一提交事务
+                if new_menus:
+                    session.execute(ScriptSyncMenu.__table__.insert(), list(new_menus.values()))
+                    session.execute(ScriptSyncSchedule.__table__.insert(), list(new_schedules.values()))
                 session.commit()
 
             # 5. 生成结果消息
@@ -2,21 +2,30 @@ import os
 import sys
 import importlib.util
 import inspect
-from typing import Any, Dict, List, Optional, Union
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
 from sqlmodel import Session, SQLModel
+from sqlalchemy.orm import scoped_session, sessionmaker
 import logging
 import json
 from croniter import croniter
 import random
 import time
+import queue
+import threading
+import itertools
 
 
 from .config import config
 from .models import ScriptSyncMenu
-from .tools import calculate_next_sync_time, import_script, store_dataframe_to_db, save_result_to_json, load_result_from_json, get_script_result, has_saved_result, get_or_create_script_schedule, store_execution_result
+from .tools import import_script, store_dataframe_to_db, save_result_to_json, load_result_from_json, get_script_result, has_saved_result, get_or_create_script_schedule, store_execution_result
+
+
+# 依赖遍历为空时的哨兵值，区分于依赖项本身可能为 None 的情况
+_NO_ITEM = object()
 
 
 class ScriptHandler:
@@ -30,6 +39,28 @@ class ScriptHandler:
         self.scripts_dir = Path(config.base_dir) / "scripts"
         self.logger = self._setup_logger()
         self.config = config
+        # 数据库引擎只初始化一次，在处理器的整个生命周期内复用
+        self._engines = config.init_db()
+        self.engine = self._engines["engine"]
+        self.script_engine = self._engines.get("script_engine", self.engine)
+        # 线程内复用的会话工厂，提交后不过期对象，避免再次查询
+        self._session_factory = scoped_session(
+            sessionmaker(bind=self.engine, class_=Session, expire_on_commit=False)
+        )
+        # 脚本函数缓存，{(脚本名称, 函数名称): (模块, 执行函数, depend 函数)}
+        self._func_cache: Dict[Tuple[str, str], Tuple[ModuleType, Callable, Optional[Callable]]] = {}
+        # 脚本列表缓存，(脚本目录修改时间, 不含文件修改时间的脚本列表信息)
+        self._scripts_listing_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        # iterator 模式下逐条产生的结果通过队列交给后台线程批量写库
+        self._write_queue: queue.Queue = queue.Queue()
+        self._write_batch_rows = 500  # 累积到多少行写一次库
+        self._write_batch_seconds = 2.0  # 最长多少秒写一次库
+        # 后台写库失败的遍历项，{执行编号: [(遍历项, 错误信息)]}，由 flush_writes 交还给对应的执行
+        self._write_errors: Dict[int, List[Tuple[Any, str]]] = {}
+        self._write_errors_lock = threading.Lock()
+        self._run_ids = itertools.count(1)
+        self._writer_thread = threading.Thread(target=self._drain_writes, daemon=True)
+        self._writer_thread.start()
 
     def _setup_logger(self) -> logging.Logger:
         """
@@ -51,6 +82,178 @@ class ScriptHandler:
 
         return logger
 
+    def _load_script(self, script_name: str) -> ModuleType:
+        """
+        导入脚本模块，文件未修改时直接复用已导入的模块
+
+        Args:
+            script_name (str): 脚本名称（不含.py扩展名）
+
+        Returns:
+            ModuleType: 导入的模块
+        """
+        # import_script 按文件修改时间缓存模块
+        return import_script(script_name, self.scripts_dir, self.logger)
+
+    def _resolve_funcs(self, script_name: str, func_name: str) -> Tuple[Callable, Optional[Callable]]:
+        """
+        获取脚本中要执行的函数和 depend 函数，模块未重新导入时复用上次的结果
+
+        Args:
+            script_name (str): 脚本名称（不含.py扩展名）
+            func_name (str): 要执行的函数名称
+
+        Returns:
+            Tuple[Callable, Optional[Callable]]: (执行函数, depend 函数)，脚本没有 depend 函数时为 None
+        """
+        module = self._load_script(script_name)
+        key = (script_name, func_name)
+        cached = self._func_cache.get(key)
+        if cached is not None and cached[0] is module:
+            return cached[1], cached[2]
+
+        func = getattr(module, func_name)
+        depend_func = getattr(module, "depend", None)
+        self._func_cache[key] = (module, func, depend_func)
+        return func, depend_func
+
+    def _store_frame(self, df: pd.DataFrame, table_name: str, engine) -> bool:
+        """
+        追加写入一个 DataFrame，出错时返回 False 而不是抛出异常
+
+        Args:
+            df (pd.DataFrame): 要写入的数据
+            table_name (str): 表名
+            engine: 数据库引擎
+
+        Returns:
+            bool: 是否写入成功
+        """
+        try:
+            return store_dataframe_to_db(df, table_name=table_name, engine=engine, logger=self.logger, is_exists="append")
+        except Exception as e:
+            self.logger.error(f"写入表 {table_name} 失败: {str(e)}")
+            return False
+
+    def _write_pending(self, pending: Dict[Tuple[str, Any], List[Tuple[int, pd.DataFrame, Any]]]) -> None:
+        """
+        按表合并待写数据后批量追加写入，整批合并或写入失败时逐个结果重试，
+        仍然失败的遍历项按执行编号记录到 _write_errors，写完后清空 pending
+
+        Args:
+            pending: {(表名, 引擎): [(执行编号, DataFrame, 遍历项)]}
+        """
+        try:
+            for (table_name, engine), entries in pending.items():
+                if len(entries) > 1:
+                    try:
+                        df = pd.concat([entry[1] for entry in entries], ignore_index=True)
+                    except Exception as e:
+                        # 列名重复等情况下无法合并，直接逐个写入
+                        self.logger.error(f"合并表 {table_name} 的待写数据失败: {str(e)}")
+                        df = None
+                    if df is not None and self._store_frame(df, table_name, engine):
+                        continue
+                    # to_sql 在一个事务内写入，整批失败时没有行落库，逐个重试以找出出错的结果
+                    self.logger.warning(f"批量写入表 {table_name} 失败，逐个重试 {len(entries)} 个结果")
+                failed = [entry for entry in entries if not self._store_frame(entry[1], table_name, engine)]
+                if failed:
+                    with self._write_errors_lock:
+                        for run_id, _, item in failed:
+                            self._write_errors.setdefault(run_id, []).append((item, f"写入表 {table_name} 失败"))
+        finally:
+            pending.clear()
+
+    def _drain_writes(self) -> None:
+        """
+        后台写库线程
+        从写入队列中取出 (执行编号, 表名, 引擎, DataFrame, 遍历项)，按表合并后批量追加写入数据库，
+        累积行数达到 _write_batch_rows 或距上次写入超过 _write_batch_seconds 时写一次，
+        收到 flush 事件时立即写入全部待写数据并通知等待方
+        单次处理出错只记录日志，线程继续运行，flush 事件总会被通知
+        """
+        pending: Dict[Tuple[str, Any], List[Tuple[int, pd.DataFrame, Any]]] = {}
+        pending_rows = 0
+        last_write = time.monotonic()
+
+        while True:
+            try:
+                item = self._write_queue.get(timeout=self._write_batch_seconds)
+            except queue.Empty:
+                item = None
+
+            try:
+                if isinstance(item, threading.Event):
+                    try:
+                        self._write_pending(pending)
+                    finally:
+                        pending_rows = 0
+                        last_write = time.monotonic()
+                        item.set()
+                    continue
+
+                if item is not None:
+                    run_id, table_name, engine, df, depend_item = item
+                    pending.setdefault((table_name, engine), []).append((run_id, df, depend_item))
+                    pending_rows += len(df) if isinstance(df, pd.DataFrame) else 1
+
+                if pending and (
+                    pending_rows >= self._write_batch_rows
+                    or time.monotonic() - last_write >= self._write_batch_seconds
+                ):
+                    pending_rows = 0
+                    last_write = time.monotonic()
+                    self._write_pending(pending)
+            except Exception as e:
+                self.logger.error(f"后台写库线程处理失败: {str(e)}")
+
+    def _write_queue_sync(self) -> None:
+        """
+        后台写库线程已退出时，在当前线程中取出写入队列中的全部数据同步写入，并通知其中的 flush 事件
+        """
+        pending: Dict[Tuple[str, Any], List[Tuple[int, pd.DataFrame, Any]]] = {}
+        events: List[threading.Event] = []
+        while True:
+            try:
+                item = self._write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                events.append(item)
+            else:
+                run_id, table_name, engine, df, depend_item = item
+                pending.setdefault((table_name, engine), []).append((run_id, df, depend_item))
+        try:
+            self._write_pending(pending)
+        finally:
+            for event in events:
+                event.set()
+
+    def flush_writes(self, run_id: Optional[int] = None) -> List[Tuple[Any, str]]:
+        """
+        等待写入队列中的全部数据写入数据库
+        后台写库线程已退出时改为在当前线程中同步写入，不会一直阻塞
+
+        Args:
+            run_id (Optional[int]): 执行编号，传入时取回该次执行写库失败的遍历项
+
+        Returns:
+            List[Tuple[Any, str]]: 该次执行写库失败的 (遍历项, 错误信息)，未传入执行编号时为空列表
+        """
+        done = threading.Event()
+        self._write_queue.put(done)
+        while not done.wait(timeout=self._write_batch_seconds):
+            if not self._writer_thread.is_alive():
+                self.logger.error("后台写库线程已退出，改为同步写入")
+                self._write_queue_sync()
+                # done 可能已被同时同步写入的其他线程取出，等待其写完后通知
+                done.wait()
+                break
+        if run_id is None:
+            return []
+        with self._write_errors_lock:
+            return self._write_errors.pop(run_id, [])
+
     def retry_script(self, script_name: str) -> Dict[str, Any]:
         """
         重试脚本的指定函数
@@ -163,27 +366,27 @@ class ScriptHandler:
 
         # 确保 actual_script_name 始终被初始化
         actual_script_name = str(script_name)
+        # 本次执行的编号，后台写库失败时据此交还失败的遍历项
+        run_id = next(self._run_ids)
         try:
-            # 初始化数据库引擎
-            engines = config.init_db()
-            script_engine = engines["script_engine"]
+            script_engine = self.script_engine
             
             # 调用脚本模块的指定函数
-            module = import_script(script_name, self.scripts_dir, self.logger)
-            func = getattr(module, func_name)
-            script_schedule = get_or_create_script_schedule(script_name, self.logger)
+            func, depend_func = self._resolve_funcs(script_name, func_name)
+            session = self._session_factory()
+            try:
+                script_schedule = get_or_create_script_schedule(script_name, self.logger, session=session)
+            finally:
+                self._session_factory.remove()
             
-            depend_func = None
-            
-            if hasattr(module, 'depend'):
-                depend_func = getattr(module, 'depend')
-                if depend_result is None:
-                    depend_result = depend_func(script_schedule, self)
+            if depend_func is not None and depend_result is None:
+                depend_result = depend_func(script_schedule, self)
             # 处理依赖结果
             if depend_result is None:
                 depend_result = []
             
-            result["total_count"] = total_count or len(depend_result)
+            # depend 可能返回生成器等无法预先求长度的可迭代对象，此时在遍历结束后再记录总数
+            result["total_count"] = total_count or (len(depend_result) if hasattr(depend_result, "__len__") else 0)
             
             if type == "iterator" or type == "iterator_single":
                 error_items = result.get("error_items")
@@ -218,64 +421,99 @@ class ScriptHandler:
                         result["message"] = f"错误恢复失败，错误索引为 {result['error_start_index']}， 错误原因: {result['errors'][result['error_start_index']]}，请检查错误项并重试"
                         raise Exception(result["message"])
 
-                if not isinstance(depend_result, list):
+                # depend 应返回列表或 None；DataFrame/Series 也可迭代，但遍历得到的是列名/值而不是行，同样拒绝
+                if isinstance(depend_result, (str, bytes, dict, pd.DataFrame, pd.Series)) or not hasattr(depend_result, "__iter__"):
                     self.logger.error(f"脚本 {script_name} 的 depend 函数返回的结果不是列表")
                     result["success"] = False
                     result["message"] = "depend 函数返回的结果不是列表"
                     return result
-                depend_result = depend_result[result["success_count"]:]
+                # 以流的方式跳过已成功的部分，不复制列表，也支持生成器
+                depend_iter = itertools.islice(depend_result, result["success_count"], None)
                 if result.get("is_error_stop"):
                     result["error_start_index"] = []
                     result["error_items"] = []
                     result["errors"] = []
                     result["error_start_index"] = 0
 
-                if len(depend_result) == 0:
+                first_item = next(depend_iter, _NO_ITEM)
+                if first_item is _NO_ITEM:
                     result["success"] = True
                     result["message"] = "执行成功,没有更多数据"
                     return result
                 else:
+                    depend_iter = itertools.chain((first_item,), depend_iter)
                     print(f'从当前成功次数为 {result["success_count"]} 开始执行')
 
-                for item in depend_result:
-                    self.logger.info(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次")
+                # 循环内高频访问的属性提前绑定为局部变量，减少每次迭代的属性查找
+                log_info = self.logger.info
+                log_error = self.logger.error
+                logger = self.logger
+                sleep = time.sleep
+                rand = random.random
+                # 遍历间隔在循环外解析一次，"1-5" 形式的范围值在区间内随机抖动
+                interval_val = result["interval"]
+                if isinstance(interval_val, str) and "-" in interval_val:
+                    interval_low, interval_high = map(int, interval_val.split("-"))
+                else:
+                    interval_low = interval_high = int(interval_val)
+                interval_span = interval_high - interval_low
+                is_error_stop = result.get("is_error_stop")
+                error_items_append = result["error_items"].append
+                errors_append = result["errors"].append
+                write_put = self._write_queue.put
+                # iterator_single 模式下收集每次的结果，避免每次迭代都重新拼接整个 DataFrame
+                single_frames: List[pd.DataFrame] = []
+                if isinstance(result["iterator_single_result"], pd.DataFrame):
+                    single_frames.append(result["iterator_single_result"])
+                single_frames_append = single_frames.append
+
+                completed = True
+                for item in depend_iter:
+                    log_info(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次")
                     try:
-                        func_result = func(script_schedule, self, item)
-                        if func_result is None:
-                            self.logger.error(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次返回 None")
+                        # 单次遍历的返回值与汇总结果 result 分开保存，只有 DataFrame 才会写库
+                        item_result = func(script_schedule, self, item)
+                        if item_result is None:
+                            log_error(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次返回 None")
                         else:
                             if save_to_db:
-                                if type == "iterator":
-                                    store_dataframe_to_db(func_result, table_name=script_name, engine=script_engine, logger=self.logger, is_exists="append")
+                                if not isinstance(item_result, pd.DataFrame):
+                                    log_error(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次返回的不是 DataFrame，不写入数据库")
+                                elif type == "iterator":
+                                    # 交给后台线程批量写库，不阻塞遍历
+                                    write_put((run_id, script_name, script_engine, item_result, item))
                                 elif type == "iterator_single":
-                                    # 会合并到一个dataframe中，在遍历完成后存储到数据库
-                                    if result["success_count"] == 0:
-                                        result["iterator_single_result"] = func_result
-                                    else:
-                                        result["iterator_single_result"] = pd.concat([result["iterator_single_result"], func_result], ignore_index=True)
+                                    # 先收集起来，在遍历完成后一次性合并并存储到数据库
+                                    single_frames_append(item_result)
                             
-                            self.logger.info(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次结果: {func_result}")
+                            log_info(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次结果: {item_result}")
                         
                     except Exception as e:
-                        self.logger.error(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次失败: {str(e)}")
-                        result["error_items"].append(item)
-                        result["errors"].append(str(e))
-                        if result.get("is_error_stop"):
+                        log_error(f"脚本 {script_name} 的函数 {func_name} 执行第 {result['success_count']} 次失败: {str(e)}")
+                        # Row/具名元组形式的遍历项转为字典，以便写入结果JSON并在重试时恢复
+                        error_items_append(item._asdict() if hasattr(item, "_asdict") else item)
+                        errors_append(str(e))
+                        if is_error_stop:
+                            completed = False
                             break
 
                     result["success_count"] += 1
                     result["execution_count"] += 1
-                    interval_val = result["interval"]
-                    if isinstance(interval_val, str) and "-" in interval_val:
-                        start, end = map(int, interval_val.split("-"))
-                        sleep_time = random.randint(start, end)
+                    if interval_span:
+                        sleep(interval_low + rand() * interval_span)
                     else:
-                        sleep_time = int(interval_val)
-                    time.sleep(sleep_time)
+                        sleep(interval_low)
+                if completed and not result["total_count"]:
+                    # 无法预先求长度的依赖在完整遍历后才能得到总数
+                    result["total_count"] = result["success_count"]
                 result["success"] = True
                 result["message"] = "执行成功"
-                if type == "iterator_single" and result["success_count"] > 0:
-                    # 遍历完成后，将结果存储到数据库
+                if single_frames:
+                    result["iterator_single_result"] = (
+                        single_frames[0] if len(single_frames) == 1 else pd.concat(single_frames, ignore_index=True)
+                    )
+                if type == "iterator_single" and single_frames:
+                    # 遍历完成后，将结果一次性存储到数据库
                     store_dataframe_to_db(result["iterator_single_result"], table_name=script_name, engine=script_engine, logger=self.logger, is_exists="replace")
 
             else:
@@ -295,14 +533,26 @@ class ScriptHandler:
             result["message"] = f"执行失败: {str(e)}"
             
         finally:
+            # 确保本次遍历产生的数据都已写入数据库，写库失败的遍历项记入错误项以便重试
+            write_failures = self.flush_writes(run_id)
+            if write_failures:
+                for failed_item, message in write_failures:
+                    result["error_items"].append(failed_item._asdict() if hasattr(failed_item, "_asdict") else failed_item)
+                    result["errors"].append(message)
+                self.logger.error(f"脚本 {script_name} 有 {len(write_failures)} 个遍历结果写入数据库失败")
+                result["success"] = False
+                result["message"] = f"{len(write_failures)} 个遍历结果写入数据库失败，已记录到 error_items"
             result["finish_time"] = datetime.now()
             save_result_to_json(actual_script_name, result, self.logger)
             return result
 
-    def list_available_scripts(self) -> Dict[str, Any]:
+    def list_available_scripts(self, include_meta: bool = True) -> Dict[str, Any]:
         """
         列出所有可用的脚本
 
+        Args:
+            include_meta (bool): 是否包含文件修改时间，为False时只读取目录项，不对每个文件调用stat
+
         Returns:
             Dict[str, Any]: 脚本列表信息
         """
@@ -312,26 +562,63 @@ class ScriptHandler:
             self.logger.warning(f"脚本目录不存在: {self.scripts_dir}")
             return scripts_info
 
-        python_files = list(self.scripts_dir.glob("*.py"))
-
-        for script_file in python_files:
-            script_name = script_file.stem
+        # 目录的修改时间在增删文件时才会变化，未变化时直接复用上次的脚本名称和路径；
+        # 原地编辑脚本不会改变目录的修改时间，文件修改时间每次重新读取
+        current_mtime = self.scripts_dir.stat().st_mtime_ns
+        cached = self._scripts_listing_cache
+        if cached is None or cached[0] != current_mtime:
+            cached = (current_mtime, self._scan_scripts())
+            self._scripts_listing_cache = cached
+        scripts_info = self._copy_scripts_info(cached[1])
+        if include_meta:
+            for script_info in itertools.chain(scripts_info["regular_scripts"], scripts_info["test_scripts"]):
+                try:
+                    script_info["modified_time"] = datetime.fromtimestamp(os.stat(script_info["file_path"]).st_mtime)
+                except FileNotFoundError:
+                    script_info["modified_time"] = None
+        return scripts_info
+
+    def _scan_scripts(self) -> Dict[str, Any]:
+        """
+        读取脚本目录中的脚本名称和路径，只读取目录项，不对每个文件调用stat
 
-            # 跳过__init__.py等特殊文件
-            if script_name.startswith("__"):
-                continue
+        Returns:
+            Dict[str, Any]: 脚本列表信息
+        """
+        scripts_info = {"total": 0, "regular_scripts": [], "test_scripts": []}
+        with os.scandir(self.scripts_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".py") or not entry.is_file():
+                    continue
+                script_name = entry.name[:-3]
 
+                # 跳过__init__.py等特殊文件
+                if script_name.startswith("__"):
+                    continue
 
-            script_info = {
-                "name": script_name,
-                "file_path": str(script_file),
-                "modified_time": datetime.fromtimestamp(script_file.stat().st_mtime),
-            }
+                script_info = {"name": script_name, "file_path": entry.path}
 
-            scripts_info["regular_scripts"].append(script_info)
+                scripts_info["regular_scripts"].append(script_info)
 
         scripts_info["total"] = len(scripts_info["regular_scripts"]) + len(
             scripts_info["test_scripts"]
         )
 
-        return scripts_info
\ No newline at end of file
+        return scripts_info
+
+    @staticmethod
+    def _copy_scripts_info(scripts_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        复制脚本列表信息，避免调用方修改缓存内容
+
+        Args:
+            scripts_info (Dict[str, Any]): 脚本列表信息
+
+        Returns:
+            Dict[str, Any]: 脚本列表信息的副本
+        """
+        return {
+            "total": scripts_info["total"],
+            "regular_scripts": [dict(info) for info in scripts_info["regular_scripts"]],
+            "test_scripts": [dict(info) for info in scripts_info["test_scripts"]],
+        }
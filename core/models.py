@@ -1,7 +1,8 @@
 from sqlmodel import SQLModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy import JSON
+from dataclasses import dataclass
+from sqlalchemy import JSON, Index
 
 
 class ScriptSyncMenu(SQLModel, table=True):
@@ -22,7 +23,12 @@ class ScriptSyncMenu(SQLModel, table=True):
     interval: Optional[str] = Field(default=None, description="执行间隔")
     is_error_stop: Optional[bool] = Field(default=False, description="是否在错误时停止")
     meta: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON, description="脚本元数据")
-    updated_at: Optional[datetime] = Field(default_factory=datetime.now, description="更新时间")
+    updated_at: Optional[datetime] = Field(
+        default_factory=datetime.now,
+        description="更新时间",
+        # Core 批量插入不经过 default_factory，由列默认值在 INSERT 时补上本地时间，与已有数据保持一致
+        sa_column_kwargs={"default": datetime.now, "onupdate": datetime.now},
+    )
     
     class Config:
         """Pydantic配置"""
@@ -38,6 +44,13 @@ class ScriptSyncSchedule(SQLModel, table=True):
     """
     是脚本的调度配置表，关联ScriptMenu表，用于存储脚本的调度配置信息
     """
+    __table_args__ = (
+        # 调度器启动时按 immediate 取出待立即执行的脚本
+        Index("ix_scriptsyncschedule_immediate_name", "immediate", "name"),
+        # 调度器加载时按 turn_on 和 period 筛选启用的脚本
+        Index("ix_scriptsyncschedule_turnon_period", "turn_on", "period"),
+    )
+
     # 主键ID，自增
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, description="脚本名称")
@@ -63,4 +76,56 @@ class ScriptSyncSchedule(SQLModel, table=True):
                 "last_sync_datetime": "2023-10-01T12:00:00",
                 "next_sync_datetime": "2023-10-01T18:00:00"
             }
-        }
\ No newline at end of file
+        }
+
+
+@dataclass(frozen=True)
+class ScriptScheduleDTO:
+    """
+    脚本调度信息的只读快照，在Session内由ScriptSyncSchedule转换，供调度线程和线程池使用
+    """
+    name: str
+    turn_on: bool
+    period: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+    step: str
+    immediate: bool
+    last_sync_datetime: Optional[datetime]
+    func_name: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, row: ScriptSyncSchedule) -> "ScriptScheduleDTO":
+        return cls(
+            name=row.name,
+            turn_on=row.turn_on,
+            period=row.period,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            step=row.step,
+            immediate=row.immediate,
+            last_sync_datetime=row.last_sync_datetime,
+            func_name=getattr(row, "func_name", None),
+        )
+
+
+@dataclass(frozen=True)
+class ScriptMenuDTO:
+    """
+    脚本菜单信息的只读快照，在Session内由ScriptSyncMenu转换，供线程池执行脚本使用
+    """
+    name: str
+    type: str
+    save_to_db: Optional[bool]
+    interval: Optional[str]
+    is_error_stop: Optional[bool]
+
+    @classmethod
+    def from_model(cls, row: ScriptSyncMenu) -> "ScriptMenuDTO":
+        return cls(
+            name=row.name,
+            type=row.type,
+            save_to_db=row.save_to_db,
+            interval=row.interval,
+            is_error_stop=row.is_error_stop,
+        )
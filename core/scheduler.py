@@ -12,19 +12,59 @@
 #     carry_up(self, script_name: str)  # 手动触发脚本的执行，会根据脚本的最后执行时间计算出一个执行时间在当前时间之前的列表，循环调用self._execute_script
 
 
+import functools
 import logging
+import queue
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from heapq import heappush, heappop
+from heapq import heapify, heappush, heappop
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from sqlmodel import Session
-from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy import and_, case, or_, select, update
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 from .config import config
-from .models import ScriptSyncSchedule, ScriptSyncMenu
+from .models import ScriptSyncSchedule, ScriptSyncMenu, ScriptScheduleDTO, ScriptMenuDTO
 from .handler import ScriptHandler
-from tools.sys.calcNextSyncDatetime import calcNextSyncDatetime, calcUnExecutedTimes
+from tools.sys.calcNextSyncDatetime import compileSchedule, calcUnExecutedTimes
+
+# 调度器只读取构造DTO所需的列，顺序与ScriptScheduleDTO/ScriptMenuDTO的字段顺序一致
+_SCHEDULE_COLUMNS = (
+    ScriptSyncSchedule.name,
+    ScriptSyncSchedule.turn_on,
+    ScriptSyncSchedule.period,
+    ScriptSyncSchedule.start_time,
+    ScriptSyncSchedule.end_time,
+    ScriptSyncSchedule.step,
+    ScriptSyncSchedule.immediate,
+    ScriptSyncSchedule.last_sync_datetime,
+)
+_MENU_COLUMNS = (
+    ScriptSyncMenu.type,
+    ScriptSyncMenu.save_to_db,
+    ScriptSyncMenu.interval,
+    ScriptSyncMenu.is_error_stop,
+)
+_N_SCHEDULE_COLUMNS = len(_SCHEDULE_COLUMNS)
+
+
+def _schedule_key(schedule: ScriptScheduleDTO) -> Tuple[bool, str, Optional[str], Optional[str], str]:
+    """
+    调度信息中决定是否入堆和下次执行时间的字段，用于判断脚本调度是否被修改
+    """
+    return (bool(schedule.turn_on and schedule.period), schedule.period, schedule.start_time, schedule.end_time, schedule.step)
+
+
+def _row_to_dtos(row) -> Tuple[ScriptScheduleDTO, ScriptMenuDTO]:
+    """
+    将 _SCHEDULE_COLUMNS + _MENU_COLUMNS 的查询结果行转换为 (调度信息, 菜单信息)
+    """
+    schedule = ScriptScheduleDTO(*row[:_N_SCHEDULE_COLUMNS])
+    menu = ScriptMenuDTO(row[0], *row[_N_SCHEDULE_COLUMNS:])
+    return schedule, menu
 
 
 class ScriptScheduler:
@@ -42,12 +82,71 @@ class ScriptScheduler:
         """
         self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # 限制已提交但未完成的任务数，超出时提交方阻塞等待
+        self._submit_slots = threading.BoundedSemaphore(max_workers * 2)
         self.scheduler_thread = None
         self.is_running = False
         self.stop_event = threading.Event()
-        self.schedule_heap = []  # 调度堆，存储(下次执行时间, 脚本名称)
+        # 调度堆，存储(单调时钟截止时间, 下次执行时间, 版本号, 脚本名称)，
+        # 按单调时钟排序和等待，不受系统时间调整影响，下次执行时间仅用于展示
+        self.schedule_heap = []
+        # 脚本调度版本号，调度变更时递增，堆中版本号不一致的条目出堆时直接丢弃
+        self._gen: Dict[str, int] = {}
+        self._cancelled: Set[str] = set()  # 已移除调度的脚本
+        # 脚本名称 -> (调度信息, 菜单信息)，由_fetch_scripts一次性加载
+        self._script_cache: Dict[str, Tuple[ScriptScheduleDTO, ScriptMenuDTO]] = {}
+        # 调度堆失效标记，初始为失效状态，首次加载后清除
+        self._heap_dirty = threading.Event()
+        self._heap_dirty.set()
+        # 调度堆变化时通知调度循环，调度堆的读写都在该条件变量的锁内进行
+        self._wake = threading.Condition()
+        # 调度堆为空时的等待时间，从最小值开始按系数递增到最大值，有任务后重置
+        self._min_backoff = 0.1
+        self._max_backoff = 5.0
+        self._backoff_factor = 1.5
+        # 调度循环出错后的等待时间，连续出错时按退避系数递增，成功一轮后重置
+        self._err_backoff = self._min_backoff
+        self._max_err_backoff = 30.0
+        # 每隔多少秒重新查询一次启用的脚本，感知其他进程（如 convert-menu）对调度表的修改
+        self._reload_seconds = 30.0
+        self._last_reload = time.monotonic()
         self.logger = self._setup_logger()
         self.handler = ScriptHandler()
+        # 数据库引擎只初始化一次，调度过程中直接复用
+        self.refresh_engines()
+        # 脚本执行完成后的 (脚本名称, 完成时间) 队列，由后台线程合并后批量更新数据库
+        self._sync_queue: "queue.Queue" = queue.Queue()
+        self._sync_batch_seconds = 0.5
+        self._sync_thread = threading.Thread(target=self._drain_last_sync, daemon=True)
+        self._sync_thread.start()
+
+    def refresh_engines(self):
+        """
+        重新初始化并缓存数据库引擎，数据库配置变化时调用
+        """
+        self._engines = config.init_db()
+        self._engine = self._engines["engine"]
+        self._script_engine = self._engines["script_engine"]
+        # 提交后不过期对象，避免为刷新刚写入的行再发起查询
+        self._session_factory = sessionmaker(bind=self._engine, class_=Session, expire_on_commit=False)
+
+    @contextmanager
+    def _session(self, session: Optional[Session] = None):
+        """
+        从会话工厂获取一个会话，退出时关闭
+        同一操作中的多个步骤可以通过参数共用该会话，传入的会话由调用方负责关闭
+
+        Args:
+            session: 调用方已打开的会话
+        """
+        if session is not None:
+            yield session
+            return
+        session = self._session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
 
     def _setup_logger(self) -> logging.Logger:
         """
@@ -79,11 +178,16 @@ class ScriptScheduler:
             self.is_running = True
             self.stop_event.clear()
 
+            # 一次查询加载所有需要调度和立即执行的脚本
+            scripts = self._fetch_scripts()
+
             # 加载所有脚本的调度信息
-            self._load_scripts()
+            self._load_scripts(scripts)
+
+            self._heap_dirty.clear()
 
             # 执行所有immediate为True的脚本
-            self._immediate_execute()
+            self._immediate_execute(scripts)
 
             # 启动调度循环线程
             self.scheduler_thread = threading.Thread(target=self.scheduler_loop, daemon=True)
@@ -107,6 +211,8 @@ class ScriptScheduler:
             self.logger.info(f"停止脚本调度器，立即模式: {immediate}")
             self.is_running = False
             self.stop_event.set()
+            with self._wake:
+                self._wake.notify_all()
 
             if immediate:
                 # 立即结束所有线程，不推荐使用，可能导致资源泄漏
@@ -117,6 +223,9 @@ class ScriptScheduler:
                 self.executor.shutdown(wait=True)
                 self.logger.info("脚本调度器已正常停止")
 
+            # 写入尚未落库的最后执行时间
+            self.flush_last_sync()
+
             if self.scheduler_thread and self.scheduler_thread.is_alive():
                 self.scheduler_thread.join(timeout=5)
                 if self.scheduler_thread.is_alive():
@@ -125,73 +234,307 @@ class ScriptScheduler:
         except Exception as e:
             self.logger.error(f"停止脚本调度器失败: {str(e)}")
 
-    def _immediate_execute(self):
+    def add_schedule(self, script_name: str):
+        """
+        新增脚本调度后调用，加载该脚本的调度信息并加入调度堆
+
+        注意：绕过add_schedule/update_schedule/remove_schedule直接修改数据库，
+        调度堆不会感知，直到下一次重新加载调度堆
+
+        Args:
+            script_name (str): 脚本名称
+        """
+        self.logger.info(f"新增脚本调度: {script_name}")
+        self._cancelled.discard(script_name)
+        self._reschedule(script_name)
+
+    def update_schedule(self, script_name: str):
+        """
+        修改脚本调度后调用，使堆中旧条目失效并按新的调度信息重新加入调度堆
+
+        Args:
+            script_name (str): 脚本名称
+        """
+        self.logger.info(f"更新脚本调度: {script_name}")
+        self._reschedule(script_name)
+
+    def remove_schedule(self, script_name: str):
+        """
+        删除或停用脚本调度后调用，堆中的旧条目在出堆时丢弃
+
+        Args:
+            script_name (str): 脚本名称
+        """
+        self.logger.info(f"移除脚本调度: {script_name}")
+        self._script_cache.pop(script_name, None)
+        self._gen[script_name] = self._gen.get(script_name, 0) + 1
+        self._cancelled.add(script_name)
+
+    def _reschedule(self, script_name: str):
+        """
+        递增脚本版本号使旧条目失效，重新查询该脚本并加入调度堆
+
+        Args:
+            script_name (str): 脚本名称
+        """
+        self._gen[script_name] = self._gen.get(script_name, 0) + 1
+        self._script_cache.pop(script_name, None)
+        script = self._fetch_script(script_name)
+        if not script:
+            return
+        self._script_cache[script_name] = script
+        schedule, _ = script
+        if schedule.turn_on and schedule.period:
+            self._push_schedule(schedule, schedule.last_sync_datetime or datetime.now())
+
+    def _push_schedule(self, script: ScriptScheduleDTO, current_datetime: datetime):
+        """
+        计算脚本的下次执行时间，并以当前版本号加入调度堆
+
+        Args:
+            script: 脚本调度信息
+            current_datetime: 计算下次执行时间的基准时间
+        """
+        entry = self._make_entry(script, current_datetime)
+        if entry:
+            with self._wake:
+                heappush(self.schedule_heap, entry)
+                self._wake.notify_all()
+
+    def _make_entry(
+        self, script: ScriptScheduleDTO, current_datetime: datetime
+    ) -> Optional[Tuple[float, datetime, int, str]]:
+        """
+        计算脚本的下次执行时间，生成带当前版本号的调度堆条目
+
+        Args:
+            script: 脚本调度信息
+            current_datetime: 计算下次执行时间的基准时间
+
+        Returns:
+            Optional[Tuple[float, datetime, int, str]]: (单调时钟截止时间, 下次执行时间, 版本号, 脚本名称)，
+                无下次执行时间时返回None
+        """
+        next_sync = self._compute_next(script, current_datetime)
+        if not next_sync:
+            return None
+        return self._entry(script.name, next_sync, self._gen.get(script.name, 0))
+
+    def _entry(self, script_name: str, next_sync: datetime, generation: int) -> Tuple[float, datetime, int, str]:
+        """
+        生成调度堆条目
+
+        Args:
+            script_name (str): 脚本名称
+            next_sync (datetime): 下次执行时间
+            generation (int): 脚本调度版本号
+
+        Returns:
+            Tuple[float, datetime, int, str]: (单调时钟截止时间, 下次执行时间, 版本号, 脚本名称)
+        """
+        self.logger.info(f"脚本 {script_name} 已加入调度堆，下次执行时间: {next_sync}")
+        deadline = time.monotonic() + (next_sync - datetime.now()).total_seconds()
+        return deadline, next_sync, generation, script_name
+
+    def _compute_next(self, script: ScriptScheduleDTO, reference_dt: datetime) -> Optional[datetime]:
+        """
+        计算脚本在reference_dt之后的下次执行时间
+        解析后的同步周期由compileSchedule按参数缓存
+
+        Args:
+            script: 脚本调度信息
+            reference_dt: 计算下次执行时间的基准时间
+
+        Returns:
+            Optional[datetime]: 下次执行时间
+        """
+        # 确保参数符合函数要求
+        start_time = script.start_time or "00:00:00"
+        end_time = script.end_time or start_time or "23:59:59"
+        step = script.step or "0"
+        return compileSchedule(script.period, start_time, end_time, step).next_after(reference_dt)
+
+    def _fetch_script(
+        self, script_name: str, session: Optional[Session] = None
+    ) -> Optional[Tuple[ScriptScheduleDTO, ScriptMenuDTO]]:
+        """
+        通过一次JOIN查询加载单个脚本的调度信息和菜单信息
+
+        Args:
+            script_name (str): 脚本名称
+            session: 调用方已打开的会话，为空时新开一个
+
+        Returns:
+            Optional[Tuple[ScriptScheduleDTO, ScriptMenuDTO]]: (调度信息, 菜单信息)，不存在时返回None
+        """
+        with self._session(session) as session:
+            row = session.query(*_SCHEDULE_COLUMNS, *_MENU_COLUMNS).join(
+                ScriptSyncMenu, ScriptSyncSchedule.name == ScriptSyncMenu.name
+            ).filter(
+                ScriptSyncSchedule.name == script_name
+            ).first()
+        return _row_to_dtos(row) if row else None
+
+    def _fetch_scripts(self, session: Optional[Session] = None) -> Dict[str, Tuple[ScriptScheduleDTO, ScriptMenuDTO]]:
+        """
+        通过一次JOIN查询加载所有需要立即执行或定时调度的脚本的调度信息和菜单信息，
+        并刷新脚本缓存
+
+        Args:
+            session: 调用方已打开的会话，为空时新开一个
+
+        Returns:
+            Dict[str, Tuple[ScriptScheduleDTO, ScriptMenuDTO]]: 脚本名称 -> (调度信息, 菜单信息)
+        """
+        with self._session(session) as session:
+            rows = session.query(*_SCHEDULE_COLUMNS, *_MENU_COLUMNS).join(
+                ScriptSyncMenu, ScriptSyncSchedule.name == ScriptSyncMenu.name
+            ).filter(
+                or_(
+                    ScriptSyncSchedule.immediate.is_(True),
+                    and_(
+                        ScriptSyncSchedule.turn_on.is_(True),
+                        ScriptSyncSchedule.period.isnot(None),
+                    ),
+                )
+            ).all()
+
+        # 只查询所需的列并直接构造DTO，不生成ORM对象
+        scripts = {row[0]: _row_to_dtos(row) for row in rows}
+        self._script_cache = scripts
+        return scripts
+
+    def _sync_scripts(self):
+        """
+        重新查询启用的脚本，与缓存比较后只重新调度新增、停用或调度参数有变化的脚本
+        调度参数未变化的脚本保留堆中的条目，不会因重新加载而重复入堆
+        """
+        self._last_reload = time.monotonic()
+        previous = self._script_cache
+        scripts = self._fetch_scripts()
+
+        for name, (schedule, _) in scripts.items():
+            old = previous.get(name)
+            key = _schedule_key(schedule)
+            if old is not None and _schedule_key(old[0]) == key:
+                continue
+            if key[0]:
+                # 新启用或调度参数有变化，递增版本号使旧条目失效后按新参数入堆
+                self.logger.info(f"脚本 {name} 的调度已变更，重新加入调度堆")
+                self._gen[name] = self._gen.get(name, 0) + 1
+                self._cancelled.discard(name)
+                self._push_schedule(schedule, schedule.last_sync_datetime or datetime.now())
+            elif old is not None and _schedule_key(old[0])[0]:
+                self.logger.info(f"脚本 {name} 的调度已停用")
+                self._gen[name] = self._gen.get(name, 0) + 1
+                self._cancelled.add(name)
+
+        for name in previous.keys() - scripts.keys():
+            if _schedule_key(previous[name][0])[0]:
+                self.remove_schedule(name)
+
+    def _immediate_execute(self, scripts: Optional[Dict[str, Tuple[ScriptScheduleDTO, ScriptMenuDTO]]] = None):
         """
         为所有schedule信息中有immediate为True的脚本调用self._execute_script
+
+        Args:
+            scripts: _fetch_scripts预先加载的脚本信息，为空时重新查询
         """
         try:
             self.logger.info("执行所有需要立即执行的脚本...")
-            engines = config.init_db()
-            engine = engines["engine"]
-
-            with Session(engine) as session:
-                # 查询所有immediate为True的脚本
-                immediate_scripts = session.query(ScriptSyncSchedule).filter(
-                    ScriptSyncSchedule.immediate == True
-                ).all()
+            if scripts is None:
+                scripts = self._fetch_scripts()
 
-            for script in immediate_scripts:
-                self.logger.info(f"立即执行脚本: {script.name}")
-                self._execute_script(script.name)
+            for name in self._claim_immediate():
+                script = scripts.get(name) or self._fetch_script(name)
+                if not script:
+                    self.logger.error(f"脚本 {name} 的调度信息或菜单不存在")
+                    continue
+                self.logger.info(f"立即执行脚本: {name}")
+                # 已启用调度的脚本在 _load_scripts 中已经入堆，完成后不再重复入堆
+                schedule = script[0]
+                self._execute_script(name, *script, reschedule=not (schedule.turn_on and schedule.period))
 
         except Exception as e:
             self.logger.error(f"执行立即脚本失败: {str(e)}")
 
-    def _load_scripts(self):
+    def _claim_immediate(self) -> List[str]:
+        """
+        在一条语句中取出并清除所有immediate为True的脚本，
+        避免读取和清除之间重启或多个调度器实例导致重复执行
+
+        Returns:
+            List[str]: 需要立即执行的脚本名称
+        """
+        stmt = update(ScriptSyncSchedule).where(
+            ScriptSyncSchedule.immediate.is_(True)
+        ).values(immediate=False)
+
+        with self._session() as session:
+            if getattr(self._engine.dialect, "update_returning", False):
+                names = session.execute(stmt.returning(ScriptSyncSchedule.name)).scalars().all()
+            else:
+                # 数据库不支持 UPDATE ... RETURNING 时（如 MySQL），在同一事务内先加锁查询再按名称清除，
+                # SELECT ... FOR UPDATE 锁住这些行，其他调度器实例要等本事务提交后才能读到清除后的值
+                names = session.execute(
+                    select(ScriptSyncSchedule.name)
+                    .where(ScriptSyncSchedule.immediate.is_(True))
+                    .with_for_update()
+                ).scalars().all()
+                if names:
+                    session.execute(stmt.where(ScriptSyncSchedule.name.in_(names)))
+            session.commit()
+        return list(names)
+
+    def _load_scripts(self, scripts: Optional[Dict[str, Tuple[ScriptScheduleDTO, ScriptMenuDTO]]] = None):
         """
         从数据库加载所有脚本的调度信息，计算下次执行时间并加入调度堆
+
+        Args:
+            scripts: _fetch_scripts预先加载的脚本信息，为空时单独查询调度表
         """
         try:
             self.logger.info("加载所有脚本的调度信息...")
-            engines = config.init_db()
-            engine = engines["engine"]
-
-            with Session(engine) as session:
-                # 查询所有脚本的调度信息
-                scripts_schedule = session.query(ScriptSyncSchedule).filter(
-                    ScriptSyncSchedule.turn_on == True and
-                    ScriptSyncSchedule.period != None
-                ).all()
-            # 清空调度堆
-            self.schedule_heap = []
-
-            for script in scripts_schedule:
-                if script.period:
-                    print(script)
-                    # 计算下次执行时间
-                    last_sync = script.last_sync_datetime or datetime.now()
-                    # 确保参数符合函数要求
-                    start_time = script.start_time or "00:00:00"
-                    end_time = script.end_time or start_time or "23:59:59"
-                    step = script.step or "0"
-                    next_sync = calcNextSyncDatetime(
-                                current_datetime=last_sync, 
-                                period=script.period,
-                                start_time=start_time,
-                                end_time=end_time,
-                                step=step
+            if scripts is not None:
+                scripts_schedule = [
+                    schedule for schedule, _ in scripts.values()
+                    if schedule.turn_on and schedule.period
+                ]
+            else:
+                with self._session() as session:
+                    # 查询所有脚本的调度信息
+                    scripts_schedule = [
+                        ScriptScheduleDTO(*row)
+                        for row in session.query(*_SCHEDULE_COLUMNS).filter(
+                            ScriptSyncSchedule.turn_on.is_(True),
+                            ScriptSyncSchedule.period.isnot(None),
                         )
-                    if next_sync:
-                        # 加入调度堆
-                        heappush(self.schedule_heap, (next_sync, script.name))
-                        self.logger.info(f"脚本 {script.name} 已加入调度堆，下次执行时间: {next_sync}")
+                    ]
+            # 重新加载后所有脚本都以当前版本号入堆，先收集全部条目再一次性建堆
+            entries = []
+            for script in scripts_schedule:
+                # 计算下次执行时间
+                entry = self._make_entry(script, script.last_sync_datetime or datetime.now())
+                if entry:
+                    entries.append(entry)
+            heapify(entries)
+            with self._wake:
+                self.schedule_heap = entries
+                self._cancelled.clear()
+                self._wake.notify_all()
 
             self.logger.info(f"共加载 {len(self.schedule_heap)} 个脚本到调度堆")
 
         except Exception as e:
             self.logger.error(f"加载脚本调度信息失败: {str(e)}")
 
-    def _execute_script(self, script_name: str):
+    def _execute_script(
+        self,
+        script_name: str,
+        script_schedule: Optional[ScriptScheduleDTO] = None,
+        script_menu: Optional[ScriptMenuDTO] = None,
+        reschedule: bool = True,
+    ):
         """
         触发脚本的执行
         使用config获取对应脚本的基本信息，将调度信息添加到基本信息的schedule字段
@@ -200,38 +543,66 @@ class ScriptScheduler:
 
         Args:
             script_name (str): 脚本名称
+            script_schedule: 预先加载的调度信息，为空时从数据库重新查询
+            script_menu: 预先加载的菜单信息，为空时从数据库重新查询
+            reschedule (bool): 执行完成后是否将下次执行时间加入调度堆，
+                补执行和已在调度堆中的立即执行为False，避免堆中出现同一脚本的重复条目
         """
         try:
             self.logger.info(f"开始执行脚本: {script_name}")
-            engines = config.init_db()
-            engine = engines["engine"]
-
-            # 查询脚本调度信息
-            with Session(engine) as session:
-                script_schedule = session.query(ScriptSyncSchedule).filter(
-                    ScriptSyncSchedule.name == script_name
-                ).first()
-                script_menu = session.query(ScriptSyncMenu).filter(
-                    ScriptSyncMenu.name == script_name
-                ).first()
-                if not script_schedule or not script_menu:
+
+            if script_schedule is None or script_menu is None:
+                # 每次执行前按名称重新查询，其他进程修改的类型、间隔等配置在本次执行即生效
+                script = self._fetch_script(script_name)
+                if not script:
                     self.logger.error(f"脚本 {script_name} 的调度信息或菜单不存在")
                     return
+                self._script_cache[script_name] = script
+                script_schedule, script_menu = script
+                if not (script_schedule.turn_on and script_schedule.period):
+                    # 堆中条目入堆后调度已被停用，本次不再执行
+                    self.logger.info(f"脚本 {script_name} 的调度已停用，跳过执行")
+                    return
+
+            # 提交前计算好下次执行时间和当前版本号，完成回调无需再读取调度信息
+            next_sync = (
+                self._compute_next(script_schedule, datetime.now())
+                if reschedule and script_schedule.period else None
+            )
+            generation = self._gen.get(script_name, 0)
 
             # 使用线程池执行脚本
-            future = self.executor.submit(self._run_script_with_handler, script_schedule, script_menu)
-            future.add_done_callback(lambda f: self._update_script_last_sync(f, script_schedule.name))
+            # 脚本名称作为参数传入，回调不再通过闭包持有调度信息对象
+            self._submit_slots.acquire()
+            try:
+                future = self.executor.submit(
+                    self._run_script_with_handler, script_schedule, script_menu, script_name
+                )
+            except Exception:
+                self._submit_slots.release()
+                raise
+            future.add_done_callback(
+                functools.partial(
+                    self._on_done, script_name=script_name, next_sync=next_sync, generation=generation
+                )
+            )
 
         except Exception as e:
             self.logger.error(f"触发脚本执行失败 {script_name}: {str(e)}")
 
-    def _run_script_with_handler(self, script_schedule: ScriptSyncSchedule, script_menu: ScriptSyncMenu) -> Dict[str, Any]:
+    def _run_script_with_handler(
+        self,
+        script_schedule: ScriptScheduleDTO,
+        script_menu: ScriptMenuDTO,
+        script_name: str,
+    ) -> Dict[str, Any]:
         """
         使用handler执行脚本
 
         Args:
             script_schedule: 脚本调度信息
             script_menu: 脚本菜单信息
+            script_name (str): 脚本名称
 
         Returns:
             Dict[str, Any]: 执行结果
@@ -252,56 +623,135 @@ class ScriptScheduler:
             )
             return result
         except Exception as e:
-            self.logger.error(f"执行脚本 {script_schedule.name} 失败: {str(e)}")
+            self.logger.error(f"执行脚本 {script_name} 失败: {str(e)}")
             return {"success": False, "message": str(e)}
 
-    def _update_script_last_sync(self, future, script_name: str):
+    def _on_done(
+        self,
+        future,
+        script_name: str,
+        next_sync: Optional[datetime] = None,
+        generation: int = 0,
+    ):
         """
-        更新脚本的最后执行时间
+        线程池任务完成回调，取出执行结果后更新最后执行时间
+        回调通过functools.partial只绑定脚本名称等基本类型参数，不持有调度信息对象
 
         Args:
             future: 线程池执行结果
             script_name (str): 脚本名称
+            next_sync (Optional[datetime]): 提交时预先计算的下次执行时间
+            generation (int): 提交时的脚本调度版本号
         """
+        self._submit_slots.release()
         try:
-            # 获取执行结果
             result = future.result()
+        except Exception as e:
+            self.logger.error(f"获取脚本 {script_name} 执行结果失败: {str(e)}")
+            return
+        finally:
+            # 尽早释放对future及其结果的引用
+            del future
+        self._update_script_last_sync(script_name, result, next_sync, generation)
+
+    def _update_script_last_sync(
+        self,
+        script_name: str,
+        result: Dict[str, Any],
+        next_sync: Optional[datetime] = None,
+        generation: int = 0,
+    ):
+        """
+        更新脚本的最后执行时间
+
+        Args:
+            script_name (str): 脚本名称
+            result (Dict[str, Any]): 脚本执行结果
+            next_sync (Optional[datetime]): 提交时预先计算的下次执行时间
+            generation (int): 提交时的脚本调度版本号
+        """
+        try:
             self.logger.info(f"脚本 {script_name} 执行完成，结果: {'成功' if result.get('success') else '失败'}")
 
-            # 更新数据库中的最后执行时间
-            engines = config.init_db()
-            engine = engines["engine"]
+            # 最后执行时间交由后台线程合并后批量写入数据库
+            self._sync_queue.put((script_name, datetime.now()))
 
-            with Session(engine) as session:
-                script_schedule = session.query(ScriptSyncSchedule).filter(
-                    ScriptSyncSchedule.name == script_name
-                ).first()
+            # 按预先计算的下次执行时间加入调度堆，执行期间调度被变更或移除的不再入堆
+            if (
+                next_sync is None
+                or not self.is_running
+                or generation != self._gen.get(script_name, 0)
+                or script_name in self._cancelled
+            ):
+                return
+            now = datetime.now()
+            if next_sync <= now:
+                # 执行耗时超过了一个周期，从完成时间重新计算
+                script = self._script_cache.get(script_name)
+                if script:
+                    next_sync = self._compute_next(script[0], now)
+            with self._wake:
+                heappush(self.schedule_heap, self._entry(script_name, next_sync, generation))
+                self._wake.notify_all()
 
-                if script_schedule:
-                    script_schedule.last_sync_datetime = datetime.now()
-                    script_schedule.immediate = False  # 执行后重置immediate标志
-                    session.add(script_schedule)
-                    session.commit()
+        except Exception as e:
+            self.logger.error(f"更新脚本 {script_name} 最后执行时间失败: {str(e)}")
 
-                    # 重新计算下次执行时间并加入调度堆
-                    if script_schedule.period and self.is_running:
-                        # 确保所有参数都有合理的默认值
-                        start_time = script_schedule.start_time or "00:00:00"
-                        end_time = script_schedule.end_time or start_time or "23:59:59"
-                        step = script_schedule.step or "0"
-                        next_sync = calcNextSyncDatetime(
-                                current_datetime=datetime.now(), 
-                                period=script_schedule.period,
-                                start_time=start_time,
-                                end_time=end_time,
-                                step=step
+    def _drain_last_sync(self):
+        """
+        后台更新线程
+        从队列中取出 (脚本名称, 完成时间)，每 _sync_batch_seconds 秒合并为一条
+        UPDATE ... WHERE name IN (...) 语句更新最后执行时间并重置immediate标志，
+        收到 flush 事件时立即写入并通知等待方
+        """
+        pending: Dict[str, datetime] = {}
+        last_write = time.monotonic()
+
+        def write_pending():
+            if not pending:
+                return
+            try:
+                with self._session() as session:
+                    session.execute(
+                        update(ScriptSyncSchedule)
+                        .where(ScriptSyncSchedule.name.in_(list(pending)))
+                        .values(
+                            last_sync_datetime=case(pending, value=ScriptSyncSchedule.name),
+                            immediate=False,
                         )
-                        if next_sync:
-                            heappush(self.schedule_heap, (next_sync, script_name))
-                            self.logger.info(f"脚本 {script_name} 已重新加入调度堆，下次执行时间: {next_sync}")
+                    )
+                    session.commit()
+            except Exception as e:
+                self.logger.error(f"批量更新脚本最后执行时间失败 {list(pending)}: {str(e)}")
+            pending.clear()
 
-        except Exception as e:
-            self.logger.error(f"更新脚本 {script_name} 最后执行时间失败: {str(e)}")
+        while True:
+            try:
+                item = self._sync_queue.get(timeout=self._sync_batch_seconds)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                write_pending()
+                last_write = time.monotonic()
+                item.set()
+                continue
+
+            if item is not None:
+                script_name, finished_at = item
+                pending[script_name] = finished_at
+
+            if pending and time.monotonic() - last_write >= self._sync_batch_seconds:
+                write_pending()
+                last_write = time.monotonic()
+
+    def flush_last_sync(self):
+        """
+        等待队列中的最后执行时间全部写入数据库
+        """
+        done = threading.Event()
+        self._sync_queue.put(done)
+        done.wait()
 
     def scheduler_loop(self):
         """
@@ -310,37 +760,56 @@ class ScriptScheduler:
         执行完毕后计算下次执行时间，更新脚本调度表后，并加入调度堆
         """
         self.logger.info("调度循环已启动")
+        backoff = self._min_backoff
 
         while self.is_running and not self.stop_event.is_set():
             try:
-                if not self.schedule_heap:
-                    # 调度堆为空，等待一段时间后重新加载脚本
-                    self.logger.info("调度堆为空，等待5秒后重新加载脚本")
-                    time.sleep(5)
-                    self._load_scripts()
+                if self._heap_dirty.is_set():
+                    # 调度信息有变更，重新加载调度堆
+                    self._heap_dirty.clear()
+                    self._load_scripts(self._fetch_scripts())
+                    self._last_reload = time.monotonic()
                     continue
 
-                # 获取下一个要执行的脚本
-                next_exec_time, script_name = heappop(self.schedule_heap)
-                now = datetime.now()
-
-                if next_exec_time > now:
-                    # 计算需要等待的时间
-                    wait_time = (next_exec_time - now).total_seconds()
-                    self.logger.info(f"等待 {wait_time:.2f} 秒后执行脚本: {script_name}")
+                if time.monotonic() - self._last_reload >= self._reload_seconds:
+                    # 定期同步数据库中新增、停用和修改的脚本
+                    self._sync_scripts()
+                    continue
 
-                    # 等待直到到达执行时间或停止信号
-                    if self.stop_event.wait(timeout=wait_time):
-                        # 收到停止信号，退出循环
-                        break
+                with self._wake:
+                    if not self.schedule_heap:
+                        # 调度堆为空，等待新任务通知，超时时间按退避系数递增
+                        self._wake.wait(timeout=backoff)
+                        backoff = min(backoff * self._backoff_factor, self._max_backoff)
+                        continue
+                    backoff = self._min_backoff
+
+                    # 查看下一个要执行的脚本
+                    deadline, _, generation, script_name = self.schedule_heap[0]
+                    if generation != self._gen.get(script_name, 0) or script_name in self._cancelled:
+                        # 调度已变更或移除的旧条目，直接丢弃
+                        heappop(self.schedule_heap)
+                        continue
+
+                    wait_time = max(0.0, deadline - time.monotonic())
+                    if wait_time:
+                        # 等待直到到达执行时间、调度堆变化、停止信号或下一次同步脚本，之后重新查看堆顶
+                        self.logger.info(f"等待 {wait_time:.2f} 秒后执行脚本: {script_name}")
+                        self._wake.wait(timeout=min(wait_time, self._reload_seconds))
+                        continue
+
+                    heappop(self.schedule_heap)
 
                 # 执行脚本
                 self._execute_script(script_name)
+                self._err_backoff = self._min_backoff
 
             except Exception as e:
-                self.logger.error(f"调度循环执行失败: {str(e)}")
-                # 防止异常导致循环退出
-                time.sleep(1)
+                self._err_backoff = min(self._err_backoff * self._backoff_factor, self._max_err_backoff)
+                self.logger.error(f"调度循环执行失败，{self._err_backoff:.2f} 秒后重试: {str(e)}")
+                # 防止异常导致循环退出，等待期间收到停止信号立即退出
+                if self.stop_event.wait(self._err_backoff):
+                    break
 
         self.logger.info("调度循环已结束")
 
@@ -355,35 +824,25 @@ class ScriptScheduler:
         """
         try:
             self.logger.info(f"手动触发脚本执行: {script_name}")
-            engines = config.init_db()
-            engine = engines["engine"]
-
-            with Session(engine) as session:
-                script_schedule = session.query(ScriptSyncSchedule).filter(
-                    ScriptSyncSchedule.name == script_name
-                ).first()
 
-                if not script_schedule:
-                    self.logger.error(f"脚本 {script_name} 的调度信息不存在")
-                    return
+            script = self._fetch_script(script_name)
+            if not script:
+                self.logger.error(f"脚本 {script_name} 的调度信息或菜单不存在")
+                return
+            script_schedule, script_menu = script
 
-                if not script_schedule.period:
-                    self.logger.error(f"脚本 {script_name} 没有设置执行周期")
-                    return
+            if not script_schedule.period:
+                self.logger.error(f"脚本 {script_name} 没有设置执行周期")
+                return
 
-                # 计算需要补执行的次数
-                last_sync = script_schedule.last_sync_datetime or datetime.now()
-                now = datetime.now()
-                exec_times = []
-
-                # 计算所有应该执行但未执行的时间点
-                exec_times = calcUnExecutedTimes(
-                    last_sync,
-                    script_schedule.period,
-                    script_schedule.start_time or "00:00:00",
-                    script_schedule.end_time or "23:59:59",
-                    script_schedule.step or "0"
-                )
+            # 计算所有应该执行但未执行的时间点
+            exec_times = calcUnExecutedTimes(
+                script_schedule.last_sync_datetime or datetime.now(),
+                script_schedule.period,
+                script_schedule.start_time or "00:00:00",
+                script_schedule.end_time or "23:59:59",
+                script_schedule.step or "0"
+            )
 
             if not exec_times:
                 self.logger.info(f"脚本 {script_name} 没有需要补执行的任务")
@@ -391,21 +850,25 @@ class ScriptScheduler:
 
             self.logger.info(f"脚本 {script_name} 需要补执行 {len(exec_times)} 次")
 
-            # 循环执行脚本
+            # 一次性提交全部补执行任务，由线程池和提交信号量控制并发
             for exec_time in exec_times:
                 self.logger.info(f"补执行脚本 {script_name}，计划执行时间: {exec_time}")
-                self._execute_script(script_name)
-                # 每次执行后等待1秒，避免过于密集
-                time.sleep(1)
+                self._execute_script(script_name, script_schedule, script_menu, reschedule=False)
 
         except Exception as e:
             self.logger.error(f"手动触发脚本执行失败 {script_name}: {str(e)}")
 
     def print_schedule_heap(self):
         """
-        打印当前调度堆中的所有任务
+        打印当前调度堆中的所有任务，调度堆尚未加载时先加载
         """
-        self._load_scripts()
+        if self._heap_dirty.is_set():
+            self._load_scripts(self._fetch_scripts())
+            self._heap_dirty.clear()
+        with self._wake:
+            entries = sorted(self.schedule_heap)
         self.logger.info("当前调度堆中的任务:")
-        for next_exec_time, script_name in self.schedule_heap:
+        for _, next_exec_time, generation, script_name in entries:
+            if generation != self._gen.get(script_name, 0) or script_name in self._cancelled:
+                continue
             print(f"📝脚本 {script_name} 下次执行时间: {next_exec_time}")
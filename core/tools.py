@@ -1,19 +1,38 @@
 # 用于存放各类工具函数
+import os
 import sys
+import math
+import sqlite3
+import tempfile
+import threading
 import importlib.util
-from typing import Any, Optional, Dict
+from contextlib import nullcontext
+from types import ModuleType
+from typing import Any, Optional, Dict, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
 from croniter import croniter
 import logging
 import json
-from sqlmodel import Session
+from sqlmodel import Session, select
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
 
 from .config import config
 from .models import ScriptSyncMenu
 
 
+# 已导入的脚本模块缓存，{脚本文件路径: (st_mtime_ns, 模块)}，文件修改后重新导入
+_module_cache: Dict[str, Tuple[int, ModuleType]] = {}
+_module_lock = threading.Lock()
+# 已加入 sys.path 的脚本目录
+_script_dirs: Set[str] = set()
+
+
 def calculate_next_sync_time(
     last_sync_time: datetime, 
     cron_expression: str, 
@@ -49,7 +68,7 @@ def import_script(
     logger: logging.Logger
 ) -> Any:
     """
-    动态导入脚本模块
+    动态导入脚本模块，脚本文件未修改时直接返回已导入的模块
 
     Args:
         script_name (str): 脚本名称（不含.py扩展名）
@@ -64,27 +83,45 @@ def import_script(
     """
     script_file = scripts_dir / f"{script_name}.py"
 
-    if not script_file.exists():
+    try:
+        mtime_ns = script_file.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"脚本文件不存在: {script_file}")
 
-    # 动态导入脚本
-    spec = importlib.util.spec_from_file_location(script_name, script_file)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"无法加载脚本规范: {script_name}")
-
-    module = importlib.util.module_from_spec(spec)
-
-    # 添加脚本目录到Python路径
-    if str(scripts_dir) not in sys.path:
-        sys.path.insert(0, str(scripts_dir))
-
-    try:
-        spec.loader.exec_module(module)
+    cache_key = str(script_file)
+    with _module_lock:
+        cached = _module_cache.get(cache_key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        # 动态导入脚本
+        spec = importlib.util.spec_from_file_location(script_name, script_file)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"无法加载脚本规范: {script_name}")
+
+        module = importlib.util.module_from_spec(spec)
+
+        # 添加脚本目录到Python路径，每个目录只添加一次
+        scripts_dir_str = str(scripts_dir)
+        if scripts_dir_str not in _script_dirs:
+            _script_dirs.add(scripts_dir_str)
+            if scripts_dir_str not in sys.path:
+                sys.path.insert(0, scripts_dir_str)
+
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            _module_cache.pop(cache_key, None)
+            logger.error(f"导入脚本失败 {script_name}: {str(e)}")
+            raise ImportError(f"导入脚本失败 {script_name}: {str(e)}")
+
+        _module_cache[cache_key] = (mtime_ns, module)
         logger.info(f"成功导入脚本: {script_name}")
         return module
-    except Exception as e:
-        logger.error(f"导入脚本失败 {script_name}: {str(e)}")
-        raise ImportError(f"导入脚本失败 {script_name}: {str(e)}")
+
+
+# SQLite 单条语句允许绑定的最大参数个数，3.32 起默认为 32766，更早的版本为 999
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
 
 
 def store_dataframe_to_db(
@@ -92,7 +129,8 @@ def store_dataframe_to_db(
     table_name: str, 
     engine, 
     logger: logging.Logger,
-    is_exists: str = "append"
+    is_exists: str = "append",
+    chunksize: int = 500,
 ) -> bool:
     """
     将DataFrame存储到数据库
@@ -103,17 +141,24 @@ def store_dataframe_to_db(
         engine: 数据库引擎
         logger (logging.Logger): 日志记录器
         is_exists (str): 表存在时的处理方式，默认是append
+        chunksize (int): 每条多行 INSERT 语句写入的行数，默认是500
 
     Returns:
         bool: 是否存储成功
     """
     try:
-        # 将DataFrame写入数据库，如果表已存在则替换
+        if engine.dialect.name == "sqlite" and len(df.columns):
+            # SQLite 限制单条语句的参数个数，列数较多时需要缩小每批行数
+            chunksize = max(1, min(chunksize, SQLITE_MAX_VARIABLES // len(df.columns)))
+
+        # 将DataFrame写入数据库，使用多行 INSERT 减少数据库往返次数
         df.to_sql(
             name=table_name,
             con=engine,
             if_exists=is_exists,
             index=False,
+            method="multi",
+            chunksize=chunksize,
         )
         records = len(df)
         logger.info(f"成功存储 {records} 条记录到表 {table_name}")
@@ -124,6 +169,79 @@ def store_dataframe_to_db(
         return False
 
 
+def _dumps_json(value: Any, indent: bool = False) -> str:
+    """
+    将任意值编码为 JSON 字符串，安装了 orjson 时优先使用 orjson
+
+    无法直接编码的类型（datetime、Timestamp、DataFrame 等）统一转为 str，
+    与 json.dumps(default=str) 的输出保持一致
+
+    Args:
+        value (Any): 要编码的值
+        indent (bool): 是否按2个空格缩进
+
+    Returns:
+        str: JSON 字符串
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=str, option=option).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, indent=2 if indent else None, default=str)
+
+
+def _encode_result_value(value: Any) -> str:
+    """
+    按已知类型编码执行结果中的单个字段值
+
+    Args:
+        value (Any): 字段值
+
+    Returns:
+        str: JSON 片段
+    """
+    # 缺失值直接用标识判断，不经过 pd.isna 的通用分派
+    if value is None or value is pd.NaT:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        # NaN/inf 不是合法的 JSON 数值，统一写为 null
+        return repr(value) if math.isfinite(value) else "null"
+    if isinstance(value, datetime):
+        # 与 default=str 的输出保持一致，以空格分隔日期和时间
+        return f'"{value.isoformat(sep=" ")}"'
+    # error_items/errors 等容器以及 DataFrame 等未知类型走通用编码
+    return _dumps_json(value)
+
+
+def _encode_execute_result(result: Dict[str, Any]) -> str:
+    """
+    将 _execute_script 生成的结果字典编码为 JSON 文本
+
+    结果字典的字段和类型是已知的，逐字段按类型直接编码，
+    只有列表类字段和未知类型才交给通用的 json 编码器
+
+    Args:
+        result (Dict[str, Any]): 执行结果字典
+
+    Returns:
+        str: JSON 文本
+    """
+    fields = [
+        f"  {json.dumps(str(key), ensure_ascii=False)}: {_encode_result_value(value)}"
+        for key, value in result.items()
+    ]
+    return "{\n" + ",\n".join(fields) + "\n}"
+
+
 def save_result_to_json(script_name: str, result: Any, logger: logging.Logger) -> bool:
     """
     将脚本执行结果保存为JSON文件
@@ -144,9 +262,24 @@ def save_result_to_json(script_name: str, result: Any, logger: logging.Logger) -
         # 生成JSON文件路径
         json_file_path = data_dir / f"{script_name}_result.json"
 
-        # 保存为JSON文件
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+        if isinstance(result, dict) and "execution_time" in result:
+            # _execute_script 的结果字典结构固定，走按类型编码的快速路径
+            payload = _encode_execute_result(result)
+        else:
+            payload = _dumps_json(result, indent=True)
+
+        # 先在内存中编码完成，写入同目录的临时文件后原子替换，读取方不会看到写了一半的文件
+        fd, tmp_path = tempfile.mkstemp(dir=data_dir, prefix=f".{script_name}_result.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb', buffering=65536) as f:
+                f.write(payload.encode('utf-8'))
+            os.replace(tmp_path, json_file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
         logger.info(f"成功将脚本 {script_name} 的执行结果保存到: {json_file_path}")
         return True
@@ -179,8 +312,10 @@ def load_result_from_json(script_name: str, logger: logging.Logger) -> Optional[
             return None
 
         # 从JSON文件读取数据
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            saved_data = json.load(f)
+        # 一次性读入整个文件后再解析
+        with open(json_file_path, 'rb', buffering=65536) as f:
+            raw = f.read()
+        saved_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         
         logger.info(f"成功从JSON文件读取脚本 {script_name} 的执行结果")
         return saved_data
@@ -225,29 +360,38 @@ def has_saved_result(script_name: str) -> bool:
         return False
 
 
-def get_or_create_script_schedule(script_name: str, logger: logging.Logger) -> ScriptSyncMenu:
+def get_or_create_script_schedule(
+    script_name: str,
+    logger: logging.Logger,
+    engine=None,
+    session: Optional[Session] = None,
+) -> ScriptSyncMenu:
     """
     获取或创建 ScriptSyncMenu 对象
 
     Args:
         script_name (str): 脚本名称
         logger (logging.Logger): 日志记录器
+        engine: 数据库引擎，默认 None 时通过 config.init_db() 获取
+        session (Optional[Session]): 调用方持有的会话，传入时直接复用，不会在此关闭
 
     Returns:
         ScriptSyncMenu: 脚本调度对象
     """
     try:
-        # 获取数据库引擎
-        engines = config.init_db()
-        engine = engines["engine"]
-
-        with Session(engine) as session:
-            # 尝试查找现有的 ScriptSyncMenu
-            script_schedule = (
-                session.query(ScriptSyncMenu)
-                .filter(ScriptSyncMenu.name == script_name)
-                .first()
-            )
+        if session is not None:
+            session_ctx = nullcontext(session)
+        else:
+            # 获取数据库引擎
+            if engine is None:
+                engine = config.init_db()["engine"]
+            session_ctx = Session(engine)
+
+        with session_ctx as session:
+            # 尝试查找现有的 ScriptSyncMenu，按索引列 name 查询且只取一行
+            script_schedule = session.exec(
+                select(ScriptSyncMenu).where(ScriptSyncMenu.name == script_name).limit(1)
+            ).first()
 
             if script_schedule is None:
                 # 创建新的 ScriptSyncMenu
@@ -270,7 +414,7 @@ def get_or_create_script_schedule(script_name: str, logger: logging.Logger) -> S
         return ScriptSyncMenu(name=script_name)
 
 
-def store_execution_result(script_name: str, result: Any, logger: logging.Logger) -> bool:
+def store_execution_result(script_name: str, result: Any, logger: logging.Logger, engine=None) -> bool:
     """
     存储执行结果到数据库
 
@@ -278,13 +422,14 @@ def store_execution_result(script_name: str, result: Any, logger: logging.Logger
         script_name (str): 脚本名称
         result (Any): 执行结果
         logger (logging.Logger): 日志记录器
+        engine: 脚本库引擎，默认 None 时通过 config.init_db() 获取
 
     Returns:
         bool: 是否存储成功
     """
     try:
-        engines = config.init_db()
-        engine = engines["script_engine"]
+        if engine is None:
+            engine = config.init_db()["script_engine"]
 
         # 如果结果是 DataFrame，使用现有的 DataFrame 存储方法
         if isinstance(result, pd.DataFrame):
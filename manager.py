@@ -16,16 +16,76 @@
 """
 
 import sys
+import logging
 import argparse
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from collections.abc import Sized
+from typing import Dict, Any, List, Optional, Tuple
+
+# core 下的模块会导入数据库驱动、pandas 等，放到实际用到时再导入，
+# 使 --help、pf 等命令不必承担这部分启动开销
+
+# 命令行输出使用独立的日志记录器，只输出消息本身到标准输出；
+# 参数在日志级别检查通过后才格式化
+log = logging.getLogger("manager")
+if not log.handlers:
+    _stdout_handler = logging.StreamHandler(sys.stdout)
+    _stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_stdout_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+# 输出用的分隔线和图标
+SEP = "-" * 50
+ICON_OK = "✅"
+ICON_FAIL = "❌"
+ICON_CREATED = "🆕"
+ICON_UPDATED = "🔄"
+STATUS_TEXT = {True: "成功", False: "失败"}
+# 转换明细的动作图标（未列出的动作为更新）和保留last_sync_datetime的提示
+_action_icon = {"created": ICON_CREATED}.get
+_PRESERVED_TEXT = {True: " (保留last_sync_datetime)", False: ""}
+
+_EXECUTION_RESULT_TEMPLATE = (
+    "{icon} 执行结果:\n"
+    "   脚本: {name}\n"
+    "   时间: {ts}\n"
+    "   状态: {status}\n"
+    "   消息: {message}"
+)
+_CONVERT_RESULT_TEMPLATE = (
+    "{icon} 转换结果:\n"
+    "   Menu文件: {menu_path}\n"
+    "   总条目数: {total_items}\n"
+    "   新创建: {created_items}\n"
+    "   更新: {updated_items}\n"
+    "   跳过: {skipped_items}\n"
+    "   状态: {status}\n"
+    "   消息: {message}"
+)
+
+# 结果详情元素个数超过该值时只打印摘要，不再转换为字符串
+_RESULT_SUMMARY_LEN = 1000
+
+
+def _execution_time_str(result: Dict[str, Any]) -> str:
+    """
+    格式化执行结果中的execution_time，格式化结果缓存在结果字典的_execution_time_str中
 
-# 添加项目根目录到 Python 路径
-sys.path.append("/Users/xiaochangming/Desktop/agent-trade/scriptSyncManager")
+    Args:
+        result (Dict[str, Any]): 执行结果
 
-from core.handler import ScriptHandler
-from core.config import config
-from core.scheduler import ScriptScheduler
+    Returns:
+        str: 格式化后的执行时间
+    """
+    time_str = result.get("_execution_time_str")
+    if time_str is None:
+        execution_time = result.get("execution_time")
+        if hasattr(execution_time, "strftime"):
+            time_str = execution_time.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            time_str = str(execution_time)
+        result["_execution_time_str"] = time_str
+    return time_str
 
 
 class Manager:
@@ -35,8 +95,19 @@ class Manager:
 
     def __init__(self):
         """初始化管理器"""
+        from core.handler import ScriptHandler
+
         self.handler = ScriptHandler()
-        self.scheduler = ScriptScheduler()
+        self._scheduler = None
+
+    @property
+    def scheduler(self):
+        """调度器，只有 ps、start 命令用到，首次访问时创建"""
+        if self._scheduler is None:
+            from core.scheduler import ScriptScheduler
+
+            self._scheduler = ScriptScheduler()
+        return self._scheduler
 
     def run_init(self,script_name: str) -> Dict[str, Any]:
         """
@@ -64,7 +135,7 @@ class Manager:
             Dict[str, Any]: 执行结果
         """
         # 使用默认配置字典，而不是Config对象
-        print(f"interval: {interval}, is_error_stop: {is_error_stop}, save_to_db: {save_to_db}")
+        log.info("interval: %s, is_error_stop: %s, save_to_db: %s", interval, is_error_stop, save_to_db)
         script_config = {
             "interval": interval,
             "is_error_stop": is_error_stop,
@@ -98,12 +169,18 @@ class Manager:
         Returns:
             Dict[str, Any]: 执行结果
         """
-        print(f"🚀 开始执行脚本: {script_name}")
+        from datetime import datetime
+
+        # 命令开始时间只取一次、格式化一次，后续打印和错误结果复用
+        now = datetime.now()
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        log.info("🚀 开始执行脚本: %s", script_name)
         if func_name:
-            print(f"   目标函数: {func_name}")
-        print(f"   数据库存储: {'启用' if save_to_db else '禁用'}")
-        print(f"   执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("-" * 50)
+            log.info("   目标函数: %s", func_name)
+        log.info("   数据库存储: %s", "启用" if save_to_db else "禁用")
+        log.info("   执行时间: %s", now_str)
+        log.info(SEP)
 
         # 执行脚本，支持多种函数名
         try:
@@ -120,7 +197,7 @@ class Manager:
                 type="single"
             )
             # 显示执行结果
-            self._print_execution_result(result, verbose)
+            self._print_execution_result(result, verbose, now_str)
 
             return result
 
@@ -128,31 +205,34 @@ class Manager:
             error_result = {
                 "success": False,
                 "script_name": script_name,
-                "execution_time": datetime.now(),
+                "execution_time": now,
                 "result": None,
                 "message": f"执行失败: {str(e)}",
                 "data_stored": False,
             }
 
-            print(f"❌ 执行失败: {str(e)}")
+            log.info("❌ 执行失败: %s", e)
             return error_result
 
-    def list(self, filter_type: str = "all", verbose: bool = False) -> Dict[str, Any]:
+    def list(self, filter_type: str = "all", verbose: bool = False, include_meta: bool = True) -> Dict[str, Any]:
         """
         列出可用的脚本
 
         Args:
             filter_type (str): 过滤类型 ('all', 'regular', 'test')
             verbose (bool): 是否显示详细信息
+            include_meta (bool): 详细信息中是否显示文件修改时间，非详细模式下不读取
 
         Returns:
             Dict[str, Any]: 脚本列表信息
         """
-        print("📋 脚本列表")
-        print("-" * 50)
+        log.info("📋 脚本列表")
+        log.info(SEP)
 
         try:
-            scripts_info = self.handler.list_available_scripts()
+            # 只有详细模式才显示修改时间，其余情况不必对每个文件调用stat
+            show_meta = verbose and include_meta
+            scripts_info = self.handler.list_available_scripts(include_meta=show_meta)
 
             if filter_type == "all":
                 display_scripts = (
@@ -160,31 +240,30 @@ class Manager:
                 )
                 title = "所有脚本"
 
-            print(f"{title} (共 {len(display_scripts)} 个):")
-            print()
+            log.info("%s (共 %s 个):", title, len(display_scripts))
+            log.info("")
 
             for i, script in enumerate(display_scripts, 1):
                 script_type = "🚀"
-                print(f"{i:2d}. {script_type} {script['name']}")
+                log.info("%2d. %s %s", i, script_type, script["name"])
 
                 if verbose:
-                    print(f"    文件: {script['file_path']}")
-                    print(
-                        f"    修改时间: {script['modified_time'].strftime('%Y-%m-%d %H:%M:%S')}"
-                    )
-                    print()
+                    log.info("    文件: %s", script["file_path"])
+                    if show_meta:
+                        log.info("    修改时间: %s", script["modified_time"].strftime("%Y-%m-%d %H:%M:%S"))
+                    log.info("")
 
             if not display_scripts:
-                print("   未找到匹配的脚本")
+                log.info("   未找到匹配的脚本")
 
             return scripts_info
 
         except Exception as e:
-            print(f"❌ 获取脚本列表失败: {str(e)}")
+            log.info("❌ 获取脚本列表失败: %s", e)
             return {"total": 0, "regular_scripts": [], "test_scripts": []}
 
     def _print_execution_result(
-        self, result: Dict[str, Any], verbose: bool = False
+        self, result: Dict[str, Any], verbose: bool = False, time_str: Optional[str] = None
     ) -> None:
         """
         打印执行结果
@@ -192,28 +271,38 @@ class Manager:
         Args:
             result (Dict[str, Any]): 执行结果
             verbose (bool): 是否显示详细信息
+            time_str (Optional[str]): 调用方已格式化的执行时间，为空时格式化结果中的execution_time
         """
-        success_icon = "✅" if result["success"] else "❌"
-        print(f"{success_icon} 执行结果:")
-        print(f"   脚本: {result['script_name']}")
-        print(f"   时间: {result['execution_time'].strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"   状态: {'成功' if result['success'] else '失败'}")
-        print(f"   消息: {result['message']}")
-
-
-        if verbose and "result" in result and result["result"] is not None:
-            print("   结果详情:")
-            if (
-                hasattr(result["result"], "__len__")
-                and len(str(result["result"])) > 200
-            ):
-                # 对于较长的结果，显示前200个字符
-                result_str = str(result["result"])[:200] + "..."
-                print(f"   {result_str}")
+        if time_str is None:
+            time_str = _execution_time_str(result)
+        success = bool(result["success"])
+        # 先拼接全部行，再一次输出
+        lines = [
+            _EXECUTION_RESULT_TEMPLATE.format(
+                icon=ICON_OK if success else ICON_FAIL,
+                name=result["script_name"],
+                ts=time_str,
+                status=STATUS_TEXT[success],
+                message=result["message"],
+            )
+        ]
+
+        value = result.get("result") if verbose else None
+        if value is not None:
+            lines.append("   结果详情:")
+            size = len(value) if isinstance(value, Sized) else None
+            if size is not None and size > _RESULT_SUMMARY_LEN:
+                # 元素过多的结果（如大的DataFrame）转换字符串开销很大，只显示类型和长度
+                result_str = f"<{type(value).__name__} len={size}>"
             else:
-                print(f"   {result['result']}")
+                result_str = str(value)
+                if len(result_str) > 200:
+                    # 对于较长的结果，显示前200个字符
+                    result_str = result_str[:200] + "..."
+            lines.append(f"   {result_str}")
 
-        print("-" * 50)
+        lines.append(SEP)
+        log.info("\n".join(lines))
 
     def convert_menu(
         self,
@@ -230,13 +319,16 @@ class Manager:
         Returns:
             Dict[str, Any]: 转换和更新结果
         """
-        print("🔄 开始转换 Menu.json")
+        from datetime import datetime
+        from core.config import config
+
+        log.info("🔄 开始转换 Menu.json")
         if menu_path:
-            print(f"   指定路径: {menu_path}")
+            log.info("   指定路径: %s", menu_path)
         else:
-            print("   使用默认路径: Menu.json")
-        print(f"   执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("-" * 50)
+            log.info("   使用默认路径: Menu.json")
+        log.info("   执行时间: %s", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        log.info(SEP)
 
         try:
             result = config.convert_menu(menu_path)
@@ -258,7 +350,7 @@ class Manager:
                 "details": [],
             }
 
-            print(f"❌ 转换失败: {str(e)}")
+            log.info("❌ 转换失败: %s", e)
             return error_result
 
     def retry(
@@ -276,15 +368,21 @@ class Manager:
         Returns:
             Dict[str, Any]: 执行结果
         """
-        print(f"🔄 开始重试脚本: {script_name}")
-        print(f"   执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("-" * 50)
+        from datetime import datetime
+
+        # 命令开始时间只取一次、格式化一次，后续打印和错误结果复用
+        now = datetime.now()
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        log.info("🔄 开始重试脚本: %s", script_name)
+        log.info("   执行时间: %s", now_str)
+        log.info(SEP)
 
         try:
             result = self.handler.retry_script(script_name)
 
             # 显示执行结果
-            self._print_execution_result(result, verbose)
+            self._print_execution_result(result, verbose, now_str)
 
             return result
 
@@ -292,26 +390,26 @@ class Manager:
             error_result = {
                 "success": False,
                 "script_name": script_name,
-                "execution_time": datetime.now(),
+                "execution_time": now,
                 "result": None,
                 "message": f"重试失败: {str(e)}",
             }
 
-            print(f"❌ 重试失败: {str(e)}")
+            log.info("❌ 重试失败: %s", e)
             return error_result
 
     def print_schedule(self):
         """
         打印当前调度堆中的所有任务
         """
-        print("📅 当前调度堆中的任务")
-        print("-" * 50)
+        log.info("📅 当前调度堆中的任务")
+        log.info(SEP)
         try:
             self.scheduler.print_schedule_heap()
-            print("-" * 50)
-            print("✅ 调度堆任务打印完成")
+            log.info(SEP)
+            log.info("✅ 调度堆任务打印完成")
         except Exception as e:
-            print(f"❌ 打印调度堆任务失败: {str(e)}")
+            log.info("❌ 打印调度堆任务失败: %s", e)
             return {"success": False, "message": str(e)}
         return {"success": True}
 
@@ -320,24 +418,26 @@ class Manager:
         启动调度器
         开始调度脚本，会调用self._load_scripts加载所有脚本的调度信息，以及_immediate_execute执行所有immediate为True的脚本
         """
-        print("🚀 启动脚本调度器")
-        print("-" * 50)
+        log.info("🚀 启动脚本调度器")
+        log.info(SEP)
         try:
             self.scheduler.start()
-            print("✅ 脚本调度器启动成功")
-            print("   调度器将在后台持续运行，处理定时任务")
-            print("   按 Ctrl+C 停止调度器")
-            print("-" * 50)
+            log.info("✅ 脚本调度器启动成功")
+            log.info("   调度器将在后台持续运行，处理定时任务")
+            log.info("   按 Ctrl+C 停止调度器")
+            log.info(SEP)
             # 保持程序运行，直到用户中断
             while True:
                 import time
                 time.sleep(1)
             return {"success": True, "message": "调度器已启动"}
         except KeyboardInterrupt:
-            print("\n⚠️  调度器被用户中断")
+            log.info("\n⚠️  调度器被用户中断")
+            # 写入尚未落库的最后执行时间
+            self.scheduler.flush_last_sync()
             return {"success": True, "message": "调度器已停止"}
         except Exception as e:
-            print(f"❌ 启动脚本调度器失败: {str(e)}")
+            log.info("❌ 启动脚本调度器失败: %s", e)
             return {"success": False, "message": str(e)}
 
     def _print_convert_result(
@@ -350,31 +450,32 @@ class Manager:
             result (Dict[str, Any]): 转换结果
             verbose (bool): 是否显示详细信息
         """
-        success_icon = "✅" if result["success"] else "❌"
-        print(f"{success_icon} 转换结果:")
-        print(f"   Menu文件: {result['menu_path']}")
-        print(f"   总条目数: {result['total_items']}")
-        print(f"   新创建: {result['created_items']}")
-        print(f"   更新: {result['updated_items']}")
-        print(f"   跳过: {result['skipped_items']}")
-        print(f"   状态: {'成功' if result['success'] else '失败'}")
-        print(f"   消息: {result['message']}")
+        success = bool(result["success"])
+        # 先拼接全部行，再一次输出
+        lines = [
+            _CONVERT_RESULT_TEMPLATE.format(
+                icon=ICON_OK if success else ICON_FAIL,
+                menu_path=result["menu_path"],
+                total_items=result["total_items"],
+                created_items=result["created_items"],
+                updated_items=result["updated_items"],
+                skipped_items=result["skipped_items"],
+                status=STATUS_TEXT[success],
+                message=result["message"],
+            )
+        ]
 
         if verbose and result["details"]:
-            print("   详细处理结果:")
-            for detail in result["details"]:
-                action_icon = "🆕" if detail["action"] == "created" else "🔄"
-                preserved = (
-                    " (保留last_sync_datetime)"
-                    if detail.get("last_sync_preserved")
-                    else ""
-                )
-                print(
-                    f"   {action_icon} {detail['script_name']} - {detail['action']}{preserved}"
-                )
-                print(f"      周期: {detail['period']}, 启用: {detail['turn_on']}")
+            lines.append("   详细处理结果:")
+            lines.extend(
+                f"   {_action_icon(d['action'], ICON_UPDATED)} {d['script_name']} - {d['action']}"
+                f"{_PRESERVED_TEXT[bool(d.get('last_sync_preserved'))]}\n"
+                f"      周期: {d['period']}, 启用: {d['turn_on']}"
+                for d in result["details"]
+            )
 
-        print("-" * 50)
+        lines.append(SEP)
+        log.info("\n".join(lines))
 
 def print_func(script_name: str) -> None:
     """
@@ -386,6 +487,7 @@ def print_func(script_name: str) -> None:
     import inspect
     import logging
     from pathlib import Path
+    from types import FunctionType
     from core.tools import import_script
     from core.config import config
     
@@ -393,88 +495,119 @@ def print_func(script_name: str) -> None:
     logger = logging.getLogger("print_func")
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     
-    print(f"脚本名称: {script_name}")
-    print("=" * 50)
+    log.info("脚本名称: %s", script_name)
+    log.info("=" * 50)
     
     try:
         # 构建脚本目录路径
         scripts_dir = Path(config.base_dir) / "scripts"
-        
+
         # 导入脚本模块
         module = import_script(script_name, scripts_dir, logger)
-        
-        # 获取脚本中的所有函数
-        functions = []
-        for name, obj in inspect.getmembers(module, inspect.isfunction):
-            # 过滤掉内置函数和私有函数（以下划线开头的函数）
-            if not name.startswith("_"):
-                # 获取函数签名
-                sig = inspect.signature(obj)
-                functions.append((name, sig))
-        
+
+        # 获取脚本中的所有函数，过滤掉私有函数（以下划线开头的函数），
+        # 只对留下的函数获取签名
+        functions = [
+            (name, inspect.signature(obj))
+            for name, obj in vars(module).items()
+            if type(obj) is FunctionType and not name.startswith("_")
+        ]
+
         if not functions:
-            print("  该脚本中没有可执行的函数")
+            log.info("  该脚本中没有可执行的函数")
         else:
-            print(f"  共找到 {len(functions)} 个函数:")
-            print("  " + "-" * 46)
+            log.info("  共找到 %s 个函数:", len(functions))
+            log.info("  " + "-" * 46)
             for func_name, func_sig in functions:
                 # 检查是否是脚本的基本函数（init, period, depend, iteration）
                 is_basic_func = func_name in ["init", "period", "depend", "iteration"]
                 func_type = "[基础函数]" if is_basic_func else "[辅助函数]"
-                print(f"  {func_type} {func_name}{func_sig}")
+                log.info("  %s %s%s", func_type, func_name, func_sig)
     
     except FileNotFoundError:
-        print(f"  错误: 脚本 '{script_name}' 不存在")
+        log.info("  错误: 脚本 '%s' 不存在", script_name)
     except ImportError as e:
-        print(f"  错误: 导入脚本失败 - {str(e)}")
+        log.info("  错误: 导入脚本失败 - %s", e)
     except Exception as e:
-        print(f"  错误: 处理脚本时发生异常 - {str(e)}")
+        log.info("  错误: 处理脚本时发生异常 - %s", e)
     
-    print("=" * 50)
+    log.info("=" * 50)
 
-def create_parser() -> argparse.ArgumentParser:
-    """
-    创建命令行参数解析器
+# run 命令的执行模式 -> 对应的管理器调用
+_MODE_DISPATCH = {
+    "init": lambda m, a: m.run_init(script_name=a.script_name),
+    "iterator": lambda m, a: m.run_iteration(
+        script_name=a.script_name,
+        interval=a.interval if a.interval else "1-5",
+        is_error_stop=a.is_error_stop,
+        save_to_db=a.save_to_db,
+    ),
+    "single": lambda m, a: m.run(
+        script_name=a.script_name,
+        func_name=a.func_name,
+        save_to_db=a.save_to_db,
+        verbose=a.verbose,
+    ),
+}
 
-    Returns:
-        argparse.ArgumentParser: 参数解析器
-    """
-    parser = argparse.ArgumentParser(
-        description="脚本同步管理器 - 用于执行和管理脚本",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-使用示例:
-  %(prog)s run sample_data_script                    # 运行脚本并保存到数据库，默认执行init函数
-  %(prog)s run sample_data_script --func main       # 运行指定函数
-  %(prog)s run sample_data_script --no-db           # 不保存到数据库
-  %(prog)s ls                                    # 列出所有脚本
-  %(prog)s ls --filter test                      # 只显示测试脚本
-  %(prog)s pf sample_data_script             # 打印脚本下的全部函数名称
-  %(prog)s ps                               # 打印所有定时任务
-  %(prog)s start                            # 启动脚本的定时任务
-  %(prog)s convert-menu                             # 转换 Menu.json
-  %(prog)s convert-menu --menu-path path/to/Menu.json  # 指定 Menu.json 路径
-  %(prog)s convert-menu -v                         # 转换 Menu.json 并显示详细信息
-  %(prog)s retry sample_data_script              # 重试脚本的上一次失败记录
-        """,
-    )
 
-    subparsers = parser.add_subparsers(dest="command", help="可用命令")
+def _exit_code(result: Dict[str, Any]) -> int:
+    """根据执行结果返回退出码"""
+    return 0 if result["success"] else 1
+
+
+def _cmd_run(manager: Manager, args: argparse.Namespace) -> int:
+    return _exit_code(_MODE_DISPATCH[args.mode](manager, args))
+
+
+def _cmd_ls(manager: Manager, args: argparse.Namespace) -> int:
+    manager.list(filter_type=args.filter, verbose=args.verbose, include_meta=args.include_meta)
+    return 0
+
+
+def _cmd_convert_menu(manager: Manager, args: argparse.Namespace) -> int:
+    return _exit_code(manager.convert_menu(menu_path=args.menu_path, verbose=args.verbose))
+
+
+def _cmd_retry(manager: Manager, args: argparse.Namespace) -> int:
+    return _exit_code(manager.retry(script_name=args.script_name, verbose=args.verbose))
+
+
+def _cmd_pf(manager: Optional[Manager], args: argparse.Namespace) -> int:
+    print_func(args.script_name)
+    return 0
+
+
+def _cmd_ps(manager: Manager, args: argparse.Namespace) -> int:
+    return _exit_code(manager.print_schedule())
+
 
-    # run 命令
+def _cmd_start(manager: Manager, args: argparse.Namespace) -> int:
+    return _exit_code(manager.start_scheduler())
+
+
+def _build_run_parser(subparsers) -> None:
+    """run 命令"""
     run_parser = subparsers.add_parser("run", help="运行指定脚本")
     run_parser.add_argument("script_name", help="脚本名称（不含.py扩展名）")
     run_parser.add_argument(
         "--func", dest="func_name", help="要执行的函数名称（不写默认为init）"
     )
     run_parser.add_argument("--no-db", action="store_false", dest="save_to_db", help="不保存结果到数据库")
-    run_parser.add_argument("--init", action="store_true", help="执行init函数")
-    run_parser.add_argument("--iterator", action="store_true", help="执行iterator函数")
+    run_parser.add_argument(
+        "--mode", choices=list(_MODE_DISPATCH), default="single", help="执行模式（默认为single）"
+    )
+    # --init / --iterator 保留为 --mode 的简写
+    run_parser.add_argument("--init", action="store_const", const="init", dest="mode", help="执行init函数")
+    run_parser.add_argument("--iterator", action="store_const", const="iterator", dest="mode", help="执行iterator函数")
     run_parser.add_argument("--interval", help="遍历时两次之间的时间间隔，支持范围值（如\"1-5\"）或固定值")
     run_parser.add_argument("--no-error-stop", action="store_false", dest="is_error_stop", help="执行出错时不停止")
     run_parser.add_argument("-v", "--verbose", action="store_true", help="显示详细信息")
+    run_parser.set_defaults(func=_cmd_run)
 
-    # list 命令
+
+def _build_ls_parser(subparsers) -> None:
+    """list 命令"""
     list_parser = subparsers.add_parser("ls", help="列出可用的脚本")
     list_parser.add_argument(
         "--filter",
@@ -485,8 +618,14 @@ def create_parser() -> argparse.ArgumentParser:
     list_parser.add_argument(
         "-v", "--verbose", action="store_true", help="显示详细信息"
     )
+    list_parser.add_argument(
+        "--no-meta", action="store_false", dest="include_meta", help="不读取文件修改时间"
+    )
+    list_parser.set_defaults(func=_cmd_ls)
+
 
-    # convert-menu 命令
+def _build_convert_menu_parser(subparsers) -> None:
+    """convert-menu 命令"""
     convert_menu_parser = subparsers.add_parser("convert-menu", help="将 Menu.json 转换为脚本调度配置")
     convert_menu_parser.add_argument(
         "--menu-path", help="Menu.json 文件路径（默认为项目根目录的 Menu.json）"
@@ -494,23 +633,184 @@ def create_parser() -> argparse.ArgumentParser:
     convert_menu_parser.add_argument(
         "-v", "--verbose", action="store_true", help="显示详细信息"
     )
-    
-    # retry 命令
+    convert_menu_parser.set_defaults(func=_cmd_convert_menu)
+
+
+def _build_retry_parser(subparsers) -> None:
+    """retry 命令"""
     retry_parser = subparsers.add_parser("retry", help="重试指定脚本")
     retry_parser.add_argument("script_name", help="脚本名称（不含.py扩展名）")
     retry_parser.add_argument(
         "-v", "--verbose", action="store_true", help="显示详细信息"
     )
-    
-    # print-func 命令
+    retry_parser.set_defaults(func=_cmd_retry)
+
+
+def _build_pf_parser(subparsers) -> None:
+    """print-func 命令"""
     print_func_parser = subparsers.add_parser("pf", help="打印指定脚本的所有函数")
     print_func_parser.add_argument("script_name", help="脚本名称（不含.py扩展名）")
+    # pf 只需导入脚本本身，不创建管理器
+    print_func_parser.set_defaults(func=_cmd_pf, needs_manager=False)
+
+
+def _build_ps_parser(subparsers) -> None:
+    """print-schedule 命令"""
+    ps_parser = subparsers.add_parser("ps", help="打印当前调度堆中的所有任务")
+    ps_parser.set_defaults(func=_cmd_ps)
+
+
+def _build_start_parser(subparsers) -> None:
+    """start-scheduler 命令"""
+    start_parser = subparsers.add_parser("start", help="启动脚本调度器")
+    start_parser.set_defaults(func=_cmd_start)
+
+
+# 子命令 -> 子命令解析器构造函数，按需构造
+_SUBPARSER_BUILDERS = {
+    "run": _build_run_parser,
+    "ls": _build_ls_parser,
+    "convert-menu": _build_convert_menu_parser,
+    "retry": _build_retry_parser,
+    "pf": _build_pf_parser,
+    "ps": _build_ps_parser,
+    "start": _build_start_parser,
+}
+
+# 常用子命令的快速解析规则，与上面的子命令解析器保持一致：
+# 子命令 -> (位置参数, 开关参数 -> (dest, 值), 带值参数 -> (dest, 可选值), 默认值)
+_FAST_SPECS: Dict[str, Tuple[Tuple[str, ...], Dict[str, Tuple[str, Any]], Dict[str, Tuple[str, Any]], Dict[str, Any]]] = {
+    "run": (
+        ("script_name",),
+        {
+            "--no-db": ("save_to_db", False),
+            "--init": ("mode", "init"),
+            "--iterator": ("mode", "iterator"),
+            "--no-error-stop": ("is_error_stop", False),
+            "-v": ("verbose", True),
+            "--verbose": ("verbose", True),
+        },
+        {
+            "--func": ("func_name", None),
+            "--mode": ("mode", _MODE_DISPATCH),
+            "--interval": ("interval", None),
+        },
+        {
+            "func_name": None, "save_to_db": True, "mode": "single", "interval": None,
+            "is_error_stop": True, "verbose": False, "func": _cmd_run,
+        },
+    ),
+    "ls": (
+        (),
+        {
+            "-v": ("verbose", True),
+            "--verbose": ("verbose", True),
+            "--no-meta": ("include_meta", False),
+        },
+        {"--filter": ("filter", ("all", "regular", "test"))},
+        {"filter": "all", "verbose": False, "include_meta": True, "func": _cmd_ls},
+    ),
+    "retry": (
+        ("script_name",),
+        {"-v": ("verbose", True), "--verbose": ("verbose", True)},
+        {},
+        {"verbose": False, "func": _cmd_retry},
+    ),
+    "pf": (("script_name",), {}, {}, {"func": _cmd_pf, "needs_manager": False}),
+    "ps": ((), {}, {}, {"func": _cmd_ps}),
+    "start": ((), {}, {}, {"func": _cmd_start}),
+}
+
+
+def _fast_parse(argv: List[str]) -> Optional[argparse.Namespace]:
+    """
+    不构造argparse解析器，直接解析常用子命令的参数
+    遇到无法识别的参数（包括-h/--help、--opt=value等写法）时返回None，由argparse处理
+
+    Args:
+        argv (List[str]): 命令行参数（不含程序名）
+
+    Returns:
+        Optional[argparse.Namespace]: 解析结果，无法快速解析时为None
+    """
+    if not argv:
+        return None
+    spec = _FAST_SPECS.get(argv[0])
+    if spec is None:
+        return None
+    positionals, switches, options, defaults = spec
+
+    values = dict(defaults)
+    values["command"] = argv[0]
+    pending = list(positionals)
+    tokens = iter(argv[1:])
+    for token in tokens:
+        if token.startswith("-"):
+            switch = switches.get(token)
+            if switch is not None:
+                values[switch[0]] = switch[1]
+                continue
+            option = options.get(token)
+            value = next(tokens, None)
+            if option is None or value is None or value.startswith("-"):
+                return None
+            dest, choices = option
+            if choices is not None and value not in choices:
+                return None
+            values[dest] = value
+        elif pending:
+            values[pending.pop(0)] = token
+        else:
+            return None
+    if pending:
+        return None
+    return argparse.Namespace(**values)
+
+
+def create_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """
+    创建命令行参数解析器
+    argv的第一个参数是已知子命令时只构造该子命令的解析器，
+    否则（--help、无参数或未知命令）构造全部子命令
+
+    Args:
+        argv (Optional[List[str]]): 命令行参数（不含程序名），默认为sys.argv[1:]
+
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    command = argv[0] if argv and argv[0] in _SUBPARSER_BUILDERS else None
+
+    parser = argparse.ArgumentParser(
+        description="脚本同步管理器 - 用于执行和管理脚本",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用示例:
+  %(prog)s run sample_data_script                    # 运行脚本并保存到数据库，默认执行init函数
+  %(prog)s run sample_data_script --func main       # 运行指定函数
+  %(prog)s run sample_data_script --no-db           # 不保存到数据库
+  %(prog)s ls                                    # 列出所有脚本
+  %(prog)s ls --filter test                      # 只显示测试脚本
+  %(prog)s pf sample_data_script             # 打印脚本下的全部函数名称
+  %(prog)s ps                               # 打印所有定时任务
+  %(prog)s start                            # 启动脚本的定时任务
+  %(prog)s convert-menu                             # 转换 Menu.json
+  %(prog)s convert-menu --menu-path path/to/Menu.json  # 指定 Menu.json 路径
+  %(prog)s convert-menu -v                         # 转换 Menu.json 并显示详细信息
+  %(prog)s retry sample_data_script              # 重试脚本的上一次失败记录
+        """,
+    )
 
-    # print-schedule 命令
-    print_schedule_parser = subparsers.add_parser("ps", help="打印当前调度堆中的所有任务")
+    subparsers = parser.add_subparsers(dest="command", help="可用命令")
 
-    # start-scheduler 命令
-    start_scheduler_parser = subparsers.add_parser("start", help="启动脚本调度器")
+    if command is not None:
+        _SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
 
     return parser
 
@@ -519,71 +819,28 @@ def main():
     """
     主函数 - 命令行入口点
     """
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    # 常用子命令直接解析，其余情况（帮助、参数错误等）交给argparse
+    args = _fast_parse(argv)
+    if args is None:
+        parser = create_parser(argv)
+        args = parser.parse_args(argv)
 
-    if not args.command:
-        parser.print_help()
-        return
+        if not args.command:
+            parser.print_help()
+            return
 
-    # 创建管理器实例
-    manager = Manager()
+    # 每个子命令通过 set_defaults 绑定了处理函数
+    manager = Manager() if getattr(args, "needs_manager", True) else None
 
     try:
-        if args.command == "run":
-            # 根据是否执行init函数和iterator函数来调用不同的方法
-            if args.init:
-                result = manager.run_init(script_name=args.script_name)
-            elif args.iterator:
-                result = manager.run_iteration(
-                    script_name=args.script_name,
-                    interval=args.interval if args.interval else "1-5",
-                    is_error_stop=args.is_error_stop,
-                    save_to_db=args.save_to_db
-                )
-            else:
-                result = manager.run(
-                    script_name=args.script_name,
-                    func_name=args.func_name,
-                    save_to_db=args.save_to_db,
-                    verbose=args.verbose,
-                )
-            # 根据执行结果设置退出码
-            sys.exit(0 if result["success"] else 1)
-
-        elif args.command == "ls":
-            result = manager.list(filter_type=args.filter, verbose=args.verbose)
-            sys.exit(0)
-
-        elif args.command == "convert-menu":
-            result = manager.convert_menu(
-                menu_path=args.menu_path, verbose=args.verbose
-            )
-            # 根据转换结果设置退出码
-            sys.exit(0 if result["success"] else 1)
-        
-        elif args.command == "retry":
-            result = manager.retry(
-                script_name=args.script_name, verbose=args.verbose
-            )
-            # 根据执行结果设置退出码
-            sys.exit(0 if result["success"] else 1)
-        
-        elif args.command == "pf":
-            print_func(args.script_name)
-            sys.exit(0)
-        elif args.command == "ps":
-            result = manager.print_schedule()
-            sys.exit(0 if result["success"] else 1)
-        elif args.command == "start":
-            result = manager.start_scheduler()
-            sys.exit(0 if result["success"] else 1)
+        sys.exit(args.func(manager, args))
 
     except KeyboardInterrupt:
-        print("\n\n⚠️  操作被用户中断")
+        log.info("\n\n⚠️  操作被用户中断")
         sys.exit(1)
     except Exception as e:
-        print(f"\n❌ 发生未预期的错误: {str(e)}")
+        log.info("\n❌ 发生未预期的错误: %s", e)
         sys.exit(1)
 
 
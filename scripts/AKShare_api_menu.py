@@ -4,6 +4,50 @@ import os
 import pandas as pd
 from tools.AKShare_api_menu.autoTransform import process_markdown_folder
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+def _dump_json(data, file_path):
+    """
+    将字典写入JSON文件，安装了 orjson 时优先使用 orjson（输出为UTF-8，不转义中文）
+    文件只供程序读取，不缩进，一次写入
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with open(file_path, "wb") as f:
+        f.write(payload)
+
+
+def load_menu_dict(file_path):
+    """
+    读取 init 或 create_menu_dict 写入的菜单字典JSON文件
+    """
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _is_up_to_date(source_dir, outputs):
+    """
+    判断输出文件是否都比源目录（目录本身及其中的文件）新
+    """
+    try:
+        with os.scandir(source_dir) as it:
+            src_mtime = max(
+                (entry.stat().st_mtime for entry in it if entry.is_file()),
+                default=0.0,
+            )
+        # 目录自身的修改时间反映文件的增删
+        src_mtime = max(src_mtime, os.stat(source_dir).st_mtime)
+        return all(os.stat(path).st_mtime >= src_mtime for path in outputs)
+    except FileNotFoundError:
+        return False
+
 
 def init(script, handler, depend):
     """
@@ -14,20 +58,30 @@ def init(script, handler, depend):
     # 1. 通过依赖中的filename获取到文件名列表
     # 2. 使用tools.AKShare_api_menu中的get_akshare_api函数获取到api列表
     print("获取到依赖了:", depend)
-    data = process_markdown_folder(os.path.join(handler.config.data_dir, "markdown/"))
+    markdown_dir = os.path.join(handler.config.data_dir, "markdown/")
     menu_path = os.path.join(handler.config.data_dir, "menu.md")
-    with open(menu_path, "w", encoding="utf-8") as f:
-        f.write(data.get("data", {}).get("menu", ""))
+    json_file_path = os.path.join(handler.config.data_dir, "menu_dict.json")
+
+    # markdown 目录未变化时直接复用上次生成的菜单字典，不再重新解析
+    if _is_up_to_date(markdown_dir, (menu_path, json_file_path)):
+        content_dict = load_menu_dict(json_file_path)
+        print(f"markdown 未修改，复用已有的JSON文件: {json_file_path}")
+        return pd.DataFrame(
+            {"title": list(content_dict), "content": list(content_dict.values())}
+        )
+
+    data = process_markdown_folder(markdown_dir)
+    # 一次编码为UTF-8后整体写入
+    menu_bytes = data.get("data", {}).get("menu", "").encode("utf-8")
+    with open(menu_path, "wb", buffering=1 << 20) as f:
+        f.write(menu_bytes)
     # 获取合并后的字典内容
     content_dict = data.get("data", {}).get("dict", {})
-    df = (
-        pd.DataFrame.from_dict(content_dict, orient="index", columns=["content"])
-        .reset_index()
-        .rename(columns={"index": "title"})
+    # 直接按列构造，避免 orient="index" 的转置
+    df = pd.DataFrame(
+        {"title": list(content_dict), "content": list(content_dict.values())}
     )
-    json_file_path = os.path.join(handler.config.data_dir, "menu_dict.json")
-    with open(json_file_path, "w", encoding="utf-8") as f:
-        json.dump(content_dict, f, ensure_ascii=False, indent=4)
+    _dump_json(content_dict, json_file_path)
     print(f"字典已保存到JSON文件: {json_file_path}")
     # 打印DataFrame的基本信息
     print(f"\n转换后的DataFrame信息：")
@@ -45,20 +99,13 @@ def depend(script, handler):
 
     # 获取文件夹下的文件名列表
     try:
-        # 检查路径是否存在
-        if os.path.exists(origin_markdown):
-            # 获取所有文件和文件夹
-            items = os.listdir(origin_markdown)
-            # 过滤出只有文件的列表
-            file_names = [
-                item
-                for item in items
-                if os.path.isfile(os.path.join(origin_markdown, item))
-            ]
-            return {"filename": file_names}
-        else:
-            print(f"警告: 路径不存在 - {origin_markdown}")
-            return {"filename": []}
+        # 遍历目录项并过滤出文件，目录项自带文件类型，不必逐个stat
+        with os.scandir(origin_markdown) as it:
+            file_names = [entry.name for entry in it if entry.is_file()]
+        return {"filename": file_names}
+    except FileNotFoundError:
+        print(f"警告: 路径不存在 - {origin_markdown}")
+        return {"filename": []}
     except Exception as e:
         print(f"获取文件名列表时发生错误: {e}")
         return {"filename": []}
@@ -70,13 +117,9 @@ def create_menu_dict(script, handler):
     """
     print("从表中读取数据...")
     df = handler.config.query_script_table("AKShare_api_menu", "SELECT *")
-    menu_dict = {}
-    for _, row in df.iterrows():
-        title = row["title"]
-        content = row["content"]
-        menu_dict[title] = content
+    # 直接按列组合为字典，不逐行构造 Series
+    menu_dict = dict(zip(df["title"].to_numpy(), df["content"].to_numpy()))
     data_dir = os.path.join(handler.config.data_dir, "AKShare_api_menu/")
     os.makedirs(data_dir, exist_ok=True)
-    with open(os.path.join(data_dir, "menu_dict.json"), "w", encoding="utf-8") as f:
-        json.dump(menu_dict, f, ensure_ascii=False, indent=4)
+    _dump_json(menu_dict, os.path.join(data_dir, "menu_dict.json"))
     print(f"创建菜单字典完成，共{len(menu_dict)}个项")
@@ -1,7 +1,14 @@
+import time
+
 import akshare as ak
 
 # 不同类型的数据脚本有不同类型的初始化函数和周期函数，需要根据具体情况进行编写。
 
+# 交易符号列表缓存，脚本模块在文件未修改时会被复用，周期执行时不必每次重新请求
+_SYMBOL_CACHE = {"ts": 0.0, "data": None}
+# 交易符号列表缓存有效期（秒）
+_SYMBOL_TTL = 3600
+
 
 def init(script, handler, depend):
     """
@@ -23,10 +30,13 @@ def period(script, handler, depend):
 
 def get_symbol_list(script, handler):
     """
-    获取外盘期货的交易符号列表
+    获取外盘期货的交易符号列表，缓存 _SYMBOL_TTL 秒
     """
-    futures_foreign_symbol_df = ak.futures_foreign_commodity_subscribe_exchange_symbol()
-    return futures_foreign_symbol_df
+    now = time.monotonic()
+    if _SYMBOL_CACHE["data"] is None or now - _SYMBOL_CACHE["ts"] >= _SYMBOL_TTL:
+        _SYMBOL_CACHE["data"] = ak.futures_foreign_commodity_subscribe_exchange_symbol()
+        _SYMBOL_CACHE["ts"] = now
+    return _SYMBOL_CACHE["data"]
 
 
 def get_real_time_price(script, handler):
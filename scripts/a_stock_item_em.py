@@ -1,4 +1,10 @@
+import os
+
 import akshare as ak
+import pandas as pd
+
+# 设置环境变量 ITER_DEBUG 时在遍历中打印股票代码和详情
+_ITER_DEBUG = bool(os.environ.get("ITER_DEBUG"))
 
 def init(script,handler,depend):
     # 初始化都是直接覆盖表
@@ -6,24 +12,32 @@ def init(script,handler,depend):
 
 def depend(script,handler):
     # 先找到依赖的股票代码
-    return handler.config.get_table_data("a_stock_list")
+    return handler.config.get_table_data("a_stock_list", as_tuples=True)
 
 def iteration(script,handler,depend_item):
-    # 遍历依赖的股票代码
-    print('遍历依赖的股票代码',depend_item['code'])
-    # 查看股票详情并返回DataFrame用于存储
-    return print_a_stock_item_em(depend_item['code'])
+    # 遍历依赖的股票代码，正常遍历时为 Row 对象，重试错误项时为从结果文件恢复的字典
+    code = depend_item['code'] if isinstance(depend_item, dict) else depend_item.code
+    if _ITER_DEBUG:
+        print('遍历依赖的股票代码',code)
+        return print_a_stock_item_em(code)
+    # 获取股票详情并返回DataFrame用于存储
+    return get_a_stock_item_em(code)
 
 
-def print_a_stock_item_em(symbol):
-    # 查看股票详情
+def get_a_stock_item_em(symbol):
+    # 获取股票详情并转换为DataFrame格式用于存储
     if symbol is None:
         raise ValueError("股票代码不能为空")
-    # 获取股票详情并转换为DataFrame格式用于存储
-    df = ak.stock_individual_info_em(symbol=symbol).set_index('item')['value'].to_frame().T
+    # item列作为列名、value列作为一行数据，直接用字典构造单行DataFrame，不做转置
+    raw = ak.stock_individual_info_em(symbol=symbol)
+    return pd.DataFrame([dict(zip(raw['item'].to_numpy(), raw['value'].to_numpy()))])
+
+
+def print_a_stock_item_em(symbol):
+    # 查看股票详情
+    df = get_a_stock_item_em(symbol)
     print(df)
     return df
 
 if __name__ == "__main__":
     print_a_stock_item_em("002700")
-
@@ -1,5 +1,60 @@
+from itertools import product
+
 import akshare as ak
 
+# 参数组合按 (市场, 币种列表, 期限列表) 分组描述，同组内币种与期限两两组合
+_FOCUS_SPECS = (
+    ("上海银行同业拆借市场", ("Shibor人民币",), ("隔夜", "3月", "1年")),
+    ("伦敦银行同业拆借市场", ("Libor英镑", "Libor美元"), ("3月",)),
+    ("欧洲银行同业拆借市场", ("Euribor欧元",), ("1周", "3月", "1年")),
+    ("香港银行同业拆借市场", ("Hibor港币", "Hibor人民币"), ("隔夜", "3月", "1年")),
+)
+
+_ALL_SPECS = (
+    ("上海银行同业拆借市场", ("Shibor人民币",), ("隔夜", "1周", "2周", "1月", "3月", "6月", "9月", "1年")),
+    (
+        "中国银行同业拆借市场",
+        ("Chibor人民币",),
+        ("隔夜", "1周", "2周", "3周", "1月", "2月", "3月", "4月", "6月", "9月", "1年"),
+    ),
+    (
+        "伦敦银行同业拆借市场",
+        ("Libor英镑", "Libor美元", "Libor欧元", "Libor日元"),
+        ("隔夜", "1周", "1月", "2月", "3月", "8月"),
+    ),
+    (
+        "欧洲银行同业拆借市场",
+        ("Euribor欧元",),
+        ("1周", "2周", "3周", "1月", "2月", "3月", "4月", "5月", "6月", "7月", "8月", "9月", "10月", "11月", "1年"),
+    ),
+    (
+        "香港银行同业拆借市场",
+        ("Hibor港币", "Hibor美元"),
+        ("隔夜", "1周", "2周", "1月", "2月", "3月", "4月", "5月", "6月", "7月", "8月", "9月", "10月", "11月", "1年"),
+    ),
+    ("香港银行同业拆借市场", ("Hibor人民币",), ("隔夜", "1周", "2周", "1月", "2月", "3月", "6月", "1年")),
+    ("新加坡银行同业拆借市场", ("Sibor星元", "Sibor美元"), ("1月", "2月", "3月", "6月", "9月", "1年")),
+)
+
+
+def _expand(specs):
+    """
+    将分组描述展开为参数字典元组
+    """
+    return tuple(
+        {"market": market, "symbol": symbol, "indicator": indicator}
+        for market, symbols, indicators in specs
+        for symbol, indicator in product(symbols, indicators)
+    )
+
+
+# 重点关注的参数组合，作为遍历函数的依赖
+_FOCUS_PARAMS = _expand(_FOCUS_SPECS)
+
+# 所有银行间同业拆借市场的参数组合
+_ALL_PARAMS = _expand(_ALL_SPECS)
+
+
 def init(script, handler, depend):
     """
     初始化函数，用于初始化银行间同业拆借利率
@@ -19,171 +74,35 @@ def iteration(script, handler, depend_item):
     """
     遍历函数，用于遍历银行间同业拆借利率的参数
     """
-    market = depend_item["market"]
-    symbol = depend_item["symbol"]
-    indicator = depend_item["indicator"]
-    rate_interbank_df = ak.rate_interbank(market=market, symbol=symbol, indicator=indicator)
-    # 添加参数列
-    rate_interbank_df["market"] = market
-    rate_interbank_df["symbol"] = symbol
-    rate_interbank_df["indicator"] = indicator
-    return rate_interbank_df
+    return _fetch(depend_item)
 
 def example(script, handler, depend_item):
     """
     示例函数，用于示例银行间同业拆借利率的参数
     """
-    depend_item = depend(script, handler)[0]
-    market = depend_item["market"]
-    symbol = depend_item["symbol"]
-    indicator = depend_item["indicator"]
+    return _fetch(depend(script, handler)[0])
+
+def _fetch(params):
+    """
+    按一组参数获取利率数据，并添加参数列
+    """
+    market = params["market"]
+    symbol = params["symbol"]
+    indicator = params["indicator"]
     rate_interbank_df = ak.rate_interbank(market=market, symbol=symbol, indicator=indicator)
-    # 添加参数列
-    rate_interbank_df["market"] = market
-    rate_interbank_df["symbol"] = symbol
-    rate_interbank_df["indicator"] = indicator
-    return rate_interbank_df
+    # 一次添加全部参数列
+    return rate_interbank_df.assign(market=market, symbol=symbol, indicator=indicator)
 
 def get_foucs_params():
-    return [
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "隔夜"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "3月"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "1年"},
-         {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "3月"},
-         {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "3月"},
-         {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "1周"},
-         {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "3月"},
-         {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "1年"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "隔夜"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "3月"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "1年"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "隔夜"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "3月"},
-         {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "1年"},
-    ]
+    """
+    返回重点关注的参数组合（只读元组，不要修改其中的字典）
+    """
+    return _FOCUS_PARAMS
 
 def print_params(script, handler, depend):
     """
     打印参数函数，用于打印银行间同业拆借利率的参数
     """
-    # 定义所有银行间同业拆借市场的参数组合
-    params_list = [
-        # 上海银行同业拆借市场
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "隔夜"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "1周"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "2周"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "1月"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "3月"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "6月"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "9月"},
-        {"market": "上海银行同业拆借市场", "symbol": "Shibor人民币", "indicator": "1年"},
-        # 中国银行同业拆借市场
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "隔夜"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "1周"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "2周"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "3周"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "1月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "2月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "3月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "4月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "6月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "9月"},
-        {"market": "中国银行同业拆借市场", "symbol": "Chibor人民币", "indicator": "1年"},
-        # 伦敦银行同业拆借市场
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "隔夜"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "1周"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "1月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "2月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "3月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor英镑", "indicator": "8月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "隔夜"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "1周"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "1月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "2月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "3月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor美元", "indicator": "8月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "隔夜"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "1周"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "1月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "2月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "3月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor欧元", "indicator": "8月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "隔夜"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "1周"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "1月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "2月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "3月"},
-        {"market": "伦敦银行同业拆借市场", "symbol": "Libor日元", "indicator": "8月"},
-        # 欧洲银行同业拆借市场
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "1周"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "2周"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "3周"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "1月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "2月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "3月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "4月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "5月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "6月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "7月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "8月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "9月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "10月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "11月"},
-        {"market": "欧洲银行同业拆借市场", "symbol": "Euribor欧元", "indicator": "1年"},
-        # 香港银行同业拆借市场
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "隔夜"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "1周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "2周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "1月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "2月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "3月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "4月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "5月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "6月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "7月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "8月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "9月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "10月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "11月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor港币", "indicator": "1年"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "隔夜"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "1周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "2周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "1月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "2月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "3月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "4月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "5月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "6月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "7月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "8月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "9月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "10月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "11月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor美元", "indicator": "1年"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "隔夜"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "1周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "2周"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "1月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "2月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "3月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "6月"},
-        {"market": "香港银行同业拆借市场", "symbol": "Hibor人民币", "indicator": "1年"},
-        # 新加坡银行同业拆借市场
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "1月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "2月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "3月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "6月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "9月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor星元", "indicator": "1年"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "1月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "2月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "3月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "6月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "9月"},
-        {"market": "新加坡银行同业拆借市场", "symbol": "Sibor美元", "indicator": "1年"},
-    ]
-    
     # 如果script.params已包含参数，则打印它
     if hasattr(script, 'params') and script.params:
         print("script.params中已有的参数:")
@@ -192,7 +111,7 @@ def print_params(script, handler, depend):
     
     # 打印所有可能的参数组合
     print("银行间同业拆借利率的所有参数组合:")
-    for i, params in enumerate(params_list, 1):
+    for i, params in enumerate(_ALL_PARAMS, 1):
         print(f"参数组合 {i}:")
         print(f"  market: {params['market']}")
         print(f"  symbol: {params['symbol']}")
@@ -0,0 +1,5 @@
+# 测试从项目根目录导入 manager、core、tools 等模块
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
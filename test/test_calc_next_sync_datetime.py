@@ -0,0 +1,108 @@
+# CompiledSchedule.next_after 的下次同步时间计算
+from datetime import datetime
+
+import pytest
+
+from tools.sys.calcNextSyncDatetime import calcNextSyncDatetime, calcUnExecutedTimes, compileSchedule
+
+
+# 2024-01-10 为周三，2024-01-12 为周五
+@pytest.mark.parametrize("current, expected", [
+    (datetime(2024, 1, 10, 7, 0), datetime(2024, 1, 10, 8, 0)),
+    (datetime(2024, 1, 10, 8, 0), datetime(2024, 1, 10, 9, 0)),
+    (datetime(2024, 1, 10, 9, 30), datetime(2024, 1, 10, 10, 0)),
+    (datetime(2024, 1, 10, 10, 0), datetime(2024, 1, 10, 11, 0)),
+    (datetime(2024, 1, 10, 17, 30, 15, 500), datetime(2024, 1, 10, 18, 0)),
+    (datetime(2024, 1, 10, 18, 0), datetime(2024, 1, 11, 8, 0)),
+    (datetime(2024, 1, 10, 23, 0), datetime(2024, 1, 11, 8, 0)),
+])
+def test_step_ticks(current, expected):
+    assert compileSchedule("every_day", "08:00:00", "18:00:00", "1h").next_after(current) == expected
+
+
+def test_step_ticks_not_dividing_the_window():
+    schedule = compileSchedule("every_day", "08:00:00", "18:00:00", "7m")
+    # 08:00 + 85*7m = 17:55，下一个点 18:02 已超过结束时间
+    assert schedule.next_after(datetime(2024, 1, 10, 17, 50)) == datetime(2024, 1, 10, 17, 55)
+    assert schedule.next_after(datetime(2024, 1, 10, 17, 55)) == datetime(2024, 1, 11, 8, 0)
+
+
+def test_step_seconds_and_minutes():
+    assert compileSchedule("every_day", "00:00:00", "23:59:59", "10s").next_after(
+        datetime(2024, 1, 10, 12, 0, 5)) == datetime(2024, 1, 10, 12, 0, 10)
+    assert compileSchedule("every_day", "00:00:00", "23:59:59", "30m").next_after(
+        datetime(2024, 1, 10, 23, 45)) == datetime(2024, 1, 11, 0, 0)
+
+
+@pytest.mark.parametrize("period, current, expected", [
+    # 目标日期在下个月不存在时取该月最后一天
+    ("every_month_31", datetime(2024, 1, 31, 10, 0), datetime(2024, 2, 29, 6, 0)),
+    ("every_month_31", datetime(2023, 1, 31, 10, 0), datetime(2023, 2, 28, 6, 0)),
+    ("every_month_15", datetime(2024, 12, 20, 10, 0), datetime(2025, 1, 15, 6, 0)),
+    ("every_month_15", datetime(2024, 1, 14, 10, 0), datetime(2024, 1, 15, 6, 0)),
+    ("every_month2_L", datetime(2024, 2, 1, 10, 0), datetime(2024, 2, 29, 6, 0)),
+    ("every_month2_L", datetime(2023, 3, 1, 10, 0), datetime(2024, 2, 29, 6, 0)),
+    ("every_month2_L", datetime(2025, 1, 5, 10, 0), datetime(2025, 2, 28, 6, 0)),
+    ("every_month2_29", datetime(2024, 3, 1, 10, 0), datetime(2025, 2, 28, 6, 0)),
+    ("every_month3_15", datetime(2024, 3, 1, 10, 0), datetime(2024, 3, 15, 6, 0)),
+])
+def test_month_end(period, current, expected):
+    # 当前时间都晚于当天的开始时间，按周期计算下一个执行日期
+    assert compileSchedule(period, "06:00:00", "06:00:00", "0").next_after(current) == expected
+
+
+@pytest.mark.parametrize("current, expected", [
+    (datetime(2024, 1, 12, 8, 0), datetime(2024, 1, 12, 9, 0)),
+    (datetime(2024, 1, 12, 10, 0), datetime(2024, 1, 15, 9, 0)),
+    (datetime(2024, 1, 13, 10, 0), datetime(2024, 1, 15, 9, 0)),
+    (datetime(2024, 1, 14, 10, 0), datetime(2024, 1, 15, 9, 0)),
+    (datetime(2024, 1, 10, 10, 0), datetime(2024, 1, 11, 9, 0)),
+])
+def test_workday_skips_weekend(current, expected):
+    assert compileSchedule("every_wDay", "09:00:00", "09:00:00", "0").next_after(current) == expected
+
+
+def test_workday_with_step_skips_weekend():
+    schedule = compileSchedule("every_wDay", "09:00:00", "11:00:00", "1h")
+    assert schedule.next_after(datetime(2024, 1, 12, 10, 30)) == datetime(2024, 1, 12, 11, 0)
+    assert schedule.next_after(datetime(2024, 1, 12, 11, 0)) == datetime(2024, 1, 15, 9, 0)
+
+
+def test_start_after_end():
+    # 开始时间晚于结束时间时当天没有执行点，步长调度取下一个执行日期的开始时间
+    schedule = compileSchedule("every_day", "20:00:00", "08:00:00", "1h")
+    assert schedule.next_after(datetime(2024, 1, 10, 10, 0)) == datetime(2024, 1, 11, 20, 0)
+    assert schedule.next_after(datetime(2024, 1, 10, 21, 0)) == datetime(2024, 1, 11, 20, 0)
+    # 步长为0时只看开始时间
+    schedule = compileSchedule("every_day", "20:00:00", "08:00:00", "0")
+    assert schedule.next_after(datetime(2024, 1, 10, 10, 0)) == datetime(2024, 1, 10, 20, 0)
+    assert schedule.next_after(datetime(2024, 1, 10, 21, 0)) == datetime(2024, 1, 11, 20, 0)
+
+
+def test_every_n_days_and_weekday():
+    assert calcNextSyncDatetime(datetime(2024, 1, 10, 12, 0), "every_day_3") == datetime(2024, 1, 13)
+    assert calcNextSyncDatetime(datetime(2024, 1, 10, 12, 0), "every_week_1") == datetime(2024, 1, 15)
+    assert calcNextSyncDatetime(datetime(2024, 1, 15, 12, 0), "every_week_1") == datetime(2024, 1, 22)
+
+
+def test_target_date():
+    assert compileSchedule("2024-03-01", "06:30:00", "06:30:00", "0").next_after(
+        datetime(2024, 1, 10)) == datetime(2024, 3, 1, 6, 30)
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        compileSchedule("every_day", "00:00:00", "23:59:59", "5x")
+    with pytest.raises(ValueError):
+        calcNextSyncDatetime(datetime(2024, 1, 10, 12, 0), "every_fortnight")
+
+
+def test_calc_unexecuted_times():
+    result = calcUnExecutedTimes(
+        datetime(2024, 1, 7, 10, 0), "every_day", now=datetime(2024, 1, 10, 12, 0)
+    )
+    assert result == [datetime(2024, 1, 8), datetime(2024, 1, 9), datetime(2024, 1, 10)]
+    result = calcUnExecutedTimes(
+        datetime(2024, 1, 10, 9, 30), "every_day", "08:00:00", "18:00:00", "1h", now=datetime(2024, 1, 10, 12, 0)
+    )
+    assert result == [datetime(2024, 1, 10, 10, 0), datetime(2024, 1, 10, 11, 0), datetime(2024, 1, 10, 12, 0)]
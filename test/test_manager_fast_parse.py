@@ -0,0 +1,64 @@
+# _fast_parse 是常用子命令参数的手写解析，与 argparse 解析器的结果保持一致
+import random
+
+import pytest
+
+from manager import _FAST_SPECS, _fast_parse, create_parser
+
+
+def _subparser(command):
+    """取出 create_parser 为 command 构造的子命令解析器"""
+    parser = create_parser([command])
+    subparsers = next(a for a in parser._actions if a.dest == "command")
+    return subparsers.choices[command]
+
+
+def _argparse(argv):
+    """用 argparse 解析，参数错误时返回 None"""
+    try:
+        return create_parser(argv).parse_args(argv)
+    except SystemExit:
+        return None
+
+
+@pytest.mark.parametrize("command", sorted(_FAST_SPECS))
+def test_fast_spec_covers_all_options(command):
+    positionals, switches, options, _ = _FAST_SPECS[command]
+    sub = _subparser(command)
+    option_strings = {
+        s for action in sub._actions for s in action.option_strings
+    } - {"-h", "--help"}
+    assert option_strings == set(switches) | set(options)
+    assert tuple(a.dest for a in sub._actions if not a.option_strings) == positionals
+
+
+@pytest.mark.parametrize("command", sorted(_FAST_SPECS))
+def test_fast_parse_matches_argparse(command):
+    positionals, switches, options, _ = _FAST_SPECS[command]
+    values = ["x", "y", "-", "--", "1-5", "--bogus"]
+    for _, choices in options.values():
+        if choices is not None:
+            values.extend(choices)
+    tokens = list(switches) + list(options) + values
+
+    rng = random.Random(command)
+    cases = [[command], [command, "x"], [command, "x", "--help"]]
+    for _ in range(2000):
+        cases.append([command] + [rng.choice(tokens) for _ in range(rng.randint(0, 6))])
+
+    matched = 0
+    for argv in cases:
+        fast = _fast_parse(argv)
+        if fast is None:
+            continue
+        matched += 1
+        expected = _argparse(argv)
+        assert expected is not None, argv
+        assert vars(fast) == vars(expected), argv
+    assert matched
+
+
+def test_fast_parse_unknown_command():
+    assert _fast_parse([]) is None
+    assert _fast_parse(["convert-menu"]) is None
+    assert _fast_parse(["nope"]) is None
@@ -1,25 +1,107 @@
 import os
 import sys
-from typing import List, Dict, Any
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # 导入需要的函数
+from mdparse import parse_once
 from markdown2knowledge import markdown_file_to_menu
 from markdown2Dict import markdown_file_to_content_dict
 
 
+def _process_one(
+    input_folder: str, filename: str, is_save: bool, output_folder: str,
+    verbose: bool = False,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    处理单个markdown文件，返回(菜单内容, 字典内容)，出错的部分为None
+    定义在模块顶层，以便在子进程中执行
+    """
+    # 构建输入文件路径
+    input_file = os.path.join(input_folder, filename)
+
+    # 获取文件名（不含扩展名）
+    file_name_without_ext = os.path.splitext(filename)[0]
+
+    # 构建输出文件路径
+    menu_output_file = os.path.join(
+        output_folder, f"{file_name_without_ext}.md"
+    )
+    dict_output_file = os.path.join(
+        output_folder, f"{file_name_without_ext}.json"
+    )
+
+    if verbose:
+        print(f"\n处理文件: {filename}")
+
+    # 每个文件只读取和解析一次，菜单格式和字典格式共用解析结果
+    try:
+        flat_data = parse_once(input_file)
+    except Exception as e:
+        print(f"解析文件时出错: {str(e)}")
+        return None, None
+
+    # 调用markdown2knowledge.py中的函数生成菜单格式
+    if verbose:
+        print(f"正在生成菜单格式...")
+    try:
+        if is_save:
+            menu_content = markdown_file_to_menu(
+                input_file, menu_output_file, flat_data=flat_data, verbose=verbose
+            )
+            if verbose:
+                print(f"菜单格式已保存到: {menu_output_file}")
+        else:
+            menu_content = markdown_file_to_menu(input_file, flat_data=flat_data, verbose=verbose)
+            if verbose:
+                print(f"菜单格式已生成")
+    except Exception as e:
+        print(f"生成菜单格式时出错: {str(e)}")
+        menu_content = None
+
+    # 调用markdown2Dict.py中的函数生成字典格式
+    if verbose:
+        print(f"正在生成字典格式...")
+    try:
+        if is_save:
+            dict_content = markdown_file_to_content_dict(
+                input_file, dict_output_file, flat_data=flat_data, verbose=verbose
+            )
+            if verbose:
+                print(f"字典格式已保存到: {dict_output_file}")
+        else:
+            dict_content = markdown_file_to_content_dict(
+                input_file, flat_data=flat_data, verbose=verbose
+            )
+            if verbose:
+                print(f"字典格式已生成")
+    except Exception as e:
+        print(f"生成字典格式时出错: {str(e)}")
+        dict_content = None
+
+    if verbose:
+        print(f"文件 {filename} 处理完成!")
+    return menu_content, dict_content
+
+
 def process_markdown_folder(
-    input_folder: str, is_save: bool = False, output_folder: str = ""
+    input_folder: str, is_save: bool = False, output_folder: str = "",
+    max_workers: Optional[int] = None, verbose: bool = False,
 ) -> Dict[str, Any]:
     """
     遍历markdown文件夹并将每个文件分别输入到两个转换函数
+    各文件的解析互不依赖且为CPU密集型，多个文件时用多进程并行处理
 
     参数：
     input_folder: 输入的markdown文件夹路径
     output_folder: 输出文件夹路径
     is_save: 是否保存到文件，默认为True
+    max_workers: 进程数，默认为CPU核数，为1时在当前进程中依次处理
+    verbose: 是否打印每个文件的处理进度，默认不打印（多进程时打印会争用标准输出）
 
     返回：
     如果is_save为False，返回{"data": {"menu": 合并后的菜单内容, "dict": 合并后的字典内容}}
@@ -29,76 +111,45 @@ def process_markdown_folder(
     if is_save:
         os.makedirs(output_folder, exist_ok=True)
 
-    # 用于存储处理结果
+    # 用于存储处理结果，各文件的菜单内容先收集起来，最后用空行连接
     results = {"menu": "", "dict": {}}
+    menu_chunks: List[str] = []
+
+    # 输入文件夹中的所有markdown文件，目录项自带文件类型，不必逐个stat
+    with os.scandir(input_folder) as it:
+        filenames = [entry.name for entry in it if entry.name.endswith(".md") and entry.is_file()]
+    n = len(filenames)
+    args = ([input_folder] * n, filenames, [is_save] * n, [output_folder] * n, [verbose] * n)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if n > 1 and max_workers > 1:
+        # 调用方（脚本处理器、调度器）进程中已有后台线程，fork 可能复制到被其他线程持有的锁而死锁，
+        # 子进程统一用 spawn 方式启动
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, n), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            outputs = list(executor.map(_process_one, *args))
+    else:
+        outputs = list(map(_process_one, *args))
 
-    # 遍历输入文件夹中的所有文件
-    for filename in os.listdir(input_folder):
-        if filename.endswith(".md"):
-            # 构建输入文件路径
-            input_file = os.path.join(input_folder, filename)
-
-            # 获取文件名（不含扩展名）
-            file_name_without_ext = os.path.splitext(filename)[0]
-
-            # 构建输出文件路径
-            menu_output_file = os.path.join(
-                output_folder, f"{file_name_without_ext}.md"
-            )
-            dict_output_file = os.path.join(
-                output_folder, f"{file_name_without_ext}.json"
-            )
+    # 如果不保存到文件，按文件顺序收集并合并结果
+    if not is_save:
+        for menu_content, dict_content in outputs:
+            if menu_content:
+                menu_chunks.append(menu_content)
+            if dict_content and isinstance(dict_content, dict):
+                # 合并字典内容，将每个文件的字典合并到总字典中
+                results["dict"].update(dict_content)
 
-            print(f"\n处理文件: {filename}")
-
-            # 调用markdown2knowledge.py中的函数生成菜单格式
-            print(f"正在生成菜单格式...")
-            try:
-                if is_save:
-                    menu_content = markdown_file_to_menu(input_file, menu_output_file)
-                    print(f"菜单格式已保存到: {menu_output_file}")
-                else:
-                    menu_content = markdown_file_to_menu(input_file)
-                    print(f"菜单格式已生成")
-            except Exception as e:
-                print(f"生成菜单格式时出错: {str(e)}")
-                menu_content = None
-
-            # 调用markdown2Dict.py中的函数生成字典格式
-            print(f"正在生成字典格式...")
-            try:
-                if is_save:
-                    dict_content = markdown_file_to_content_dict(
-                        input_file, dict_output_file
-                    )
-                    print(f"字典格式已保存到: {dict_output_file}")
-                else:
-                    dict_content = markdown_file_to_content_dict(input_file)
-                    print(f"字典格式已生成")
-            except Exception as e:
-                print(f"生成字典格式时出错: {str(e)}")
-                dict_content = None
-
-            # 如果不保存到文件，收集并合并结果
-            if not is_save:
-                if menu_content:
-                    # 合并菜单内容，每个文件的菜单内容用空行分隔
-                    results["menu"] += menu_content + "\n\n"
-                if dict_content and isinstance(dict_content, dict):
-                    # 合并字典内容，将每个文件的字典合并到总字典中
-                    results["dict"].update(dict_content)
-
-            print(f"文件 {filename} 处理完成!")
-
-    print(f"\n所有文件处理完成!")
+    if verbose:
+        print(f"\n所有文件处理完成!")
 
     # 根据is_save参数返回不同的结果
     if is_save:
         return {"status": "success"}
     else:
-        # 去除菜单内容末尾多余的空行
-        if results["menu"].endswith("\n\n"):
-            results["menu"] = results["menu"][:-2]
+        # 合并菜单内容，每个文件的菜单内容用空行分隔
+        results["menu"] = "\n\n".join(menu_chunks)
         return {"data": results}
 
 
@@ -116,13 +167,13 @@ if __name__ == "__main__":
         # 用户指定了输入和输出文件夹
         input_folder = sys.argv[1]
         output_folder = sys.argv[2]
-        process_markdown_folder(input_folder, output_folder)
+        process_markdown_folder(input_folder, output_folder, verbose=True)
     elif len(sys.argv) == 4:
         # 用户指定了输入、输出文件夹和is_save参数
         input_folder = sys.argv[1]
         output_folder = sys.argv[2]
         is_save = sys.argv[3].lower() == "true"
-        result = process_markdown_folder(input_folder, output_folder, is_save)
+        result = process_markdown_folder(input_folder, output_folder, is_save, verbose=True)
         if not is_save:
             print(f"处理结果: {result}")
     else:
@@ -130,4 +181,4 @@ if __name__ == "__main__":
         print(f"使用默认路径:")
         print(f"输入文件夹: {DEFAULT_INPUT_FOLDER}")
         print(f"输出文件夹: {DEFAULT_OUTPUT_FOLDER}")
-        process_markdown_folder(DEFAULT_INPUT_FOLDER, DEFAULT_OUTPUT_FOLDER)
+        process_markdown_folder(DEFAULT_INPUT_FOLDER, DEFAULT_OUTPUT_FOLDER, verbose=True)
@@ -0,0 +1,154 @@
+import os
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional
+
+# markdown2Dict.py 和 markdown2knowledge.py 共用的解析步骤：
+# markdown -> 树状结构（origin2Tree.py的功能）-> 扁平化JSON（tree2FlatJson.py的功能）
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+
+
+def markdown_to_tree(markdown_text: str) -> List[Dict[str, Any]]:
+    """
+    将markdown文本转换为树状结构
+
+    参数：
+    markdown_text: 输入的markdown文本
+
+    返回：
+    标题节点列表，每个节点包含title、content和children
+    """
+    result = []
+    stack = []
+    heading_match = HEADING_PATTERN.match
+    in_code_block = False
+    # 当前标题节点及其内容行，遇到下一个标题时写入节点
+    current_node = None
+    content_lines = []
+
+    for line in markdown_text.strip().split('\n'):
+        stripped = line.strip()
+        # 遇到 ``` 时切换是否在代码块中，代码块中的行只作为内容，不作为标题
+        if stripped.startswith('```'):
+            in_code_block = not in_code_block
+            content_lines.append(stripped)
+            continue
+
+        match = None if in_code_block else heading_match(line)
+        if not match:
+            content_lines.append(stripped)
+            continue
+
+        if current_node is not None:
+            current_node['content'] = '\n'.join(content_lines).strip()
+        content_lines = []
+
+        level = len(match.group(1))
+        title = match.group(2)
+        new_item = {
+            'title': title,
+            'content': '',
+            'children': []
+        }
+
+        if not stack:
+            result.append(new_item)
+            stack.append((level, new_item))
+        else:
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            if stack:
+                parent = stack[-1][1]
+                parent['children'].append(new_item)
+            else:
+                result.append(new_item)
+            stack.append((level, new_item))
+        current_node = new_item
+
+    if current_node is not None:
+        current_node['content'] = '\n'.join(content_lines).strip()
+
+    return result
+
+
+def iter_flat_json(
+    tree_data: List[Dict[str, Any]], keyword: Optional[str] = None
+) -> Iterator[Dict[str, str]]:
+    """
+    逐个生成树状结构扁平化后的条目，标题以 - 连接各级父标题
+    只需遍历一次的调用方可以直接消费，不必先构造完整列表
+
+    参数：
+    tree_data: markdown_to_tree 返回的树状结构
+    keyword: 只生成content中包含该关键字的条目（可选），在拼接content之前判断
+
+    返回：
+    包含title和content的字典的迭代器
+    """
+    # 用显式栈做先序遍历，不递归；父标题用元组保存，子节点之间共享
+    stack = [(node, ()) for node in reversed(tree_data)]
+    while stack:
+        node, parent_titles = stack.pop()
+        current_titles = parent_titles + (node["title"],)
+
+        node_content = node.get('content', '')
+        if node_content.strip():
+            title_part = '-'.join(current_titles)
+            # 关键字不含换行，拼接后的content包含它当且仅当标题或原内容包含它
+            if keyword is None or keyword in node_content or keyword in title_part:
+                yield {
+                    "title": title_part,
+                    "content": f'### {title_part}\n\n{node_content}'
+                }
+
+        for child in reversed(node.get('children', [])):
+            stack.append((child, current_titles))
+
+
+def tree_to_flat_json(tree_data: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    将树状结构转换为扁平化JSON，标题以 - 连接各级父标题
+
+    参数：
+    tree_data: markdown_to_tree 返回的树状结构
+
+    返回：
+    包含title和content的字典列表
+    """
+    return list(iter_flat_json(tree_data))
+
+
+def parse_markdown(markdown_text: str) -> List[Dict[str, str]]:
+    """
+    将markdown文本解析为扁平化JSON
+    """
+    return tree_to_flat_json(markdown_to_tree(markdown_text))
+
+
+def iter_markdown(markdown_text: str, keyword: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    将markdown文本解析为扁平化条目的迭代器，不构造中间列表
+    keyword 见 iter_flat_json
+    """
+    return iter_flat_json(markdown_to_tree(markdown_text), keyword)
+
+
+@lru_cache(maxsize=64)
+def _parse_file(markdown_file_path: str, mtime_ns: int) -> List[Dict[str, str]]:
+    with open(markdown_file_path, 'r', encoding='utf-8') as f:
+        return parse_markdown(f.read())
+
+
+def parse_once(markdown_file_path: str) -> List[Dict[str, str]]:
+    """
+    读取并解析markdown文件为扁平化JSON，文件未修改时直接返回上次的解析结果
+    返回的列表会被多个转换函数共用，调用方不要修改
+
+    参数：
+    markdown_file_path: markdown文件路径
+
+    返回：
+    包含title和content的字典列表
+    """
+    return _parse_file(markdown_file_path, os.stat(markdown_file_path).st_mtime_ns)
@@ -1,23 +1,117 @@
 # 从指定的数据库表中读取数据,并将其转换为JSON格式
-import pandas as pd
-from sqlalchemy import text
-from core.config import Config
+import datetime
+import io
+import json
+import math
+from functools import lru_cache
+
+from sqlalchemy import LargeBinary, MetaData, Table, select, text
+from core.config import config
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# 每批从数据库读取并编码的行数
+_BATCH_ROWS = 1000
+
+
+@lru_cache(maxsize=1)
+def _engine():
+    """
+    脚本库引擎，只创建一次，多次调用复用同一个连接池
+    """
+    return config.init_db()["script_engine"]
+
+
+@lru_cache(maxsize=128)
+def _table_select(table_name):
+    """
+    反射表结构（每张表只反射一次），返回只包含非二进制列的查询
+    二进制列无法编码为JSON，不必从数据库读取
+    """
+    table = Table(table_name, MetaData(), autoload_with=_engine())
+    columns = [c for c in table.c if not isinstance(c.type, LargeBinary)]
+    return select(*columns)
+
+
+def _json_default(value):
+    """
+    orjson 与 json 无法直接编码的值：日期时间类型输出 isoformat()，其余转为字符串
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+# 未安装 orjson 时使用的编码器，分隔符和转义规则与 orjson 一致
+_json_encode = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=_json_default
+).encode
+
+
+def _float_json(value):
+    """
+    按 orjson 的格式编码浮点数：NaN/Infinity 输出 null，
+    负指数不补零，1e-5 量级用定点小数表示
+    """
+    if not math.isfinite(value):
+        return "null"
+    text = repr(value)
+    mantissa, sep, exp = text.partition("e-")
+    if not sep:
+        return text
+    if exp == "05":
+        sign = "-" if mantissa.startswith("-") else ""
+        return sign + "0.0000" + mantissa.lstrip("-").replace(".", "")
+    return f"{mantissa}e-{int(exp)}"
+
+
+def _dumps_row(row):
+    """
+    用标准库 json 编码一行字典，浮点数单独处理以保证与 orjson 输出相同
+    """
+    return "{" + ",".join(
+        _json_encode(key) + ":" + (_float_json(value) if isinstance(value, float) else _json_encode(value))
+        for key, value in row.items()
+    ) + "}"
+
+
+def _dumps_rows(rows):
+    """
+    将一批行字典编码为JSON数组（bytes），安装了 orjson 时优先使用 orjson
+    两种方式输出的字节完全相同
+    """
+    if orjson is not None:
+        return orjson.dumps(rows, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return ("[" + ",".join(_dumps_row(row) for row in rows) + "]").encode("utf-8")
+
 
 def read_table_to_json(table_name, query=""):
     """
     从指定的数据库表中读取数据,并将其转换为JSON格式
+    直接按批读取数据库行并编码，不构造 DataFrame
     """
-    # 从配置中获取数据库引擎
-    config = Config()
-    engine = config.script_db_engine
+    # 获取（缓存的）脚本库引擎
+    engine = _engine()
     # 构建SQL查询
     if query:
         sql_query = text(query)
     else:
-        sql_query = text(f"SELECT * FROM {table_name}")
-    # 从数据库中读取数据
-    df = pd.read_sql(sql_query, engine)
-    # 将数据转换为JSON格式
-    json_data = df.to_json(orient="records", force_ascii=False)
-    return json_data
-
+        sql_query = _table_select(table_name)
+    # 从数据库中按批读取数据，逐批编码后拼接为一个JSON数组
+    buf = io.BytesIO()
+    buf.write(b"[")
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=_BATCH_ROWS).execute(sql_query)
+        keys = list(result.keys())
+        first = True
+        for partition in result.partitions():
+            if not first:
+                buf.write(b",")
+            # 去掉每批数组的首尾方括号
+            buf.write(_dumps_rows([dict(zip(keys, row)) for row in partition])[1:-1])
+            first = False
+    buf.write(b"]")
+    return buf.getvalue().decode("utf-8")
@@ -10,23 +10,36 @@
 # 输出: "2024-06-17 00:00:00,2024-06-17 05:00:00"
 
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+import calendar
 import re
 
+# 时间范围字符串的正则，模块加载时编译一次
+_TIME_RANGE_RE = re.compile(r'^(\d+)([YMDH])$')
 
-def str_to_time_range(time_str):
+
+def _months_before(dt, months):
+    """
+    返回dt往前推months个月的时间，目标月份没有对应的日期时取该月最后一天
+    （与 relativedelta(months=months) 相减的结果相同，如3月31日往前推1个月为2月28/29日）
+    """
+    year, month = divmod(dt.year * 12 + dt.month - 1 - months, 12)
+    month += 1
+    return dt.replace(year=year, month=month, day=min(dt.day, calendar.monthrange(year, month)[1]))
+
+
+def str_to_time_range(time_str, now=None):
     """
     将字符串时间范围转换为具体时间区间
     
     参数:
         time_str: str, 时间范围字符串，如"5Y", "5M", "5D", "5H"
+        now: datetime, 当前时间（可选），批量调用时由调用方传入同一个值，为空时取 datetime.now()
     
     返回:
         str: 格式化的时间范围字符串，如"2020-12-12,2025-12-12"
     """
     # 验证输入格式
-    pattern = r'^(\d+)([YMDH])$'
-    match = re.match(pattern, time_str)
+    match = _TIME_RANGE_RE.match(time_str)
     if not match:
         return ""
     
@@ -35,14 +48,14 @@ def str_to_time_range(time_str):
     unit = match.group(2)
     
     # 获取当前时间作为结束时间
-    end_date = datetime.now()
+    end_date = now if now is not None else datetime.now()
     
     # 根据时间单位计算开始时间
     if unit == 'Y':  # 年
-        start_date = end_date - relativedelta(years=num)
+        start_date = _months_before(end_date, num * 12)
         format_str = "%Y-%m-%d"
     elif unit == 'M':  # 月
-        start_date = end_date - relativedelta(months=num)
+        start_date = _months_before(end_date, num)
         format_str = "%Y-%m-%d"
     elif unit == 'D':  # 日
         start_date = end_date - timedelta(days=num)
@@ -8,10 +8,48 @@
 #       4. news数据(没有周期,初始化时间范围,只有上一次同步时间(为空)
 
 import json
+import logging
 import os
 
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 调度条目除name外的字段及缺省值，按DataFrame的列顺序排列
+# 缺省的 {} 为所有条目共享的同一个对象，下游只读取不修改
+_EMPTY_DICT = {}
+_ITEM_DEFAULTS = (
+    ("cn_name", ""),
+    ("desc", ""),
+    ("interval", ""),
+    ("is_error_stop", False),
+    ("type", ""),
+    ("schedule", _EMPTY_DICT),
+    ("meta", _EMPTY_DICT),
+    ("save_to_db", True),
+)
+
+
+def _walk_menu_items(menu):
+    """
+    按先序遍历已解析的菜单，逐个生成带name字段的条目
+    用显式栈代替递归，子列表按原顺序出栈
+    """
+    stack = list(reversed(menu))
+    while stack:
+        item = stack.pop()
+        # 是否有turn_on和name字段
+        if "name" in item:
+            yield item
+        # 检查是否有子列表需要遍历
+        if "list" in item:
+            stack.extend(reversed(item["list"]))
+
 
 def convert_menu_to_script_schedule(
     menu_path: str,
@@ -25,46 +63,31 @@ def convert_menu_to_script_schedule(
     返回:
         pd.DataFrame: 转换后的script_schedule DataFrame
     """
-    print("menu_path", menu_path)
+    logger.debug("menu_path %s", menu_path)
     try:
+        # 按列收集各字段，最后一次性按列构造DataFrame，不逐行构造字典
+        names = []
+        columns = {key: [] for key, _ in _ITEM_DEFAULTS}
+        appenders = [(columns[key].append, key, default) for key, default in _ITEM_DEFAULTS]
+
         # 读取Menu.json文件
-        with open(menu_path, "r", encoding="utf-8") as f:
-            menu = json.load(f)
-
-        script_schedule = []
-
-        # 递归遍历函数
-        def traverse_items(items):
-            for item in items:
-                # 是否有turn_on和name字段
-                if "name" in item:
-                    # 创建script_schedule条目
-                    schedule_item = {
-                        "name": item["name"],
-                        "cn_name": item.get("cn_name", ""),
-                        "desc": item.get("desc", ""),
-                        "interval": item.get("interval", ""),
-                        "is_error_stop": item.get("is_error_stop", False),
-                        "type": item.get("type", ""),
-                        "schedule": item.get("schedule", {}),
-                        "meta": item.get("meta", {}),
-                        "save_to_db": item.get("save_to_db", True),
-                    }
-
-                    script_schedule.append(schedule_item)
-
-                # 检查是否有子列表需要遍历
-                if "list" in item:
-                    traverse_items(item["list"])
-
-        # 开始遍历
-        traverse_items(menu)
+        # 一次性读入整个文件后再解析，安装了 orjson 时优先使用 orjson
+        with open(menu_path, "rb") as f:
+            raw = f.read()
+        menu = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        for item in _walk_menu_items(menu):
+            # 追加script_schedule条目的各字段，缺省值共用模块级常量
+            names.append(item["name"])
+            get = item.get
+            for append, key, default in appenders:
+                append(get(key, default))
         
-        print(f"转换成功！生成了 {len(script_schedule)} 个调度条目")
-        return pd.DataFrame(script_schedule)
+        logger.info("转换成功！生成了 %d 个调度条目", len(names))
+        return pd.DataFrame({"name": names, **columns})
 
     except Exception as e:
-        print(f"转换失败：{str(e)}")
+        logger.error("转换失败：%s", e)
         return False
 
 
@@ -72,6 +95,7 @@ def convert_menu_to_script_schedule(
 
 # 测试示例
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     DEFAULT_MENU_PATH = os.path.join(os.path.dirname(__file__), "Menu.json")
     # 使用默认路径进行转换
     convert_menu_to_script_schedule(
@@ -17,8 +17,33 @@
 
 from datetime import datetime, timedelta
 import calendar
-import re
+import string
+from functools import lru_cache
 
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+# 以下解析函数都是字符串的纯函数，调度时反复以相同参数调用，结果按参数缓存
+@lru_cache(maxsize=256)
+def _split_token(token):
+    """把"day6"、"minute5"这样的片段拆成开头的字母部分和剩余部分，如("day", "6")"""
+    i = 0
+    n = len(token)
+    while i < n and token[i] in _ASCII_LETTERS:
+        i += 1
+    return token[:i], token[i:]
+
+@lru_cache(maxsize=256)
+def _split_interval(token):
+    """解析间隔片段(如"minute5"、"sec10"、"hour1")，返回间隔类型和数值"""
+    interval_type, tail = _split_token(token)
+    j = 0
+    while j < len(tail) and tail[j].isdecimal():
+        j += 1
+    if not interval_type or j == 0:
+        raise ValueError(f"Invalid interval format: {token}")
+    return interval_type, int(tail[:j])
+
+@lru_cache(maxsize=256)
 def parse_hour(hour_str):
     """解析小时字符串，支持范围格式(如"6-14")，返回开始小时和结束小时"""
     if '-' in hour_str:
@@ -142,93 +167,116 @@ def get_next_workday_time(last_sync, hour, end_hour=None):
                 break
     return next_sync
 
-def calc_next_sync_datetime(period, last_sync_datetime=None):
+def _next_day(last_sync, tail, base_parts):
+    """every_day_6 / every_day6_6(每隔6天6点)"""
+    hour, end_hour = parse_hour(base_parts[1])
+    if not tail:
+        return get_next_day_time(last_sync, hour, end_hour)
+    return get_next_day_time(last_sync, hour, end_hour, int(tail))
+
+def _next_workday(last_sync, tail, base_parts):
+    """every_WDay_6"""
+    if tail:
+        return None
+    hour, end_hour = parse_hour(base_parts[1])
+    return get_next_workday_time(last_sync, hour, end_hour)
+
+def _next_weekday(last_sync, tail, base_parts):
+    """every_week1_6"""
+    weekday = int(tail)
+    hour, end_hour = parse_hour(base_parts[1])
+    return get_next_weekday_time(last_sync, weekday, hour, end_hour)
+
+def _next_month(last_sync, tail, base_parts):
+    """every_month_3_6 / every_month3_L_6"""
+    if len(base_parts) < 3:
+        return None
+    month = int(tail) if tail else int(base_parts[1])
+    hour, end_hour = parse_hour(base_parts[2])
+    return get_next_month_time(last_sync, month, base_parts[1], hour, end_hour)
+
+# every_xxx 格式按基础片段开头的字母部分分派，返回None表示格式不支持
+_EVERY_HANDLERS = {
+    "day": _next_day,
+    "WDay": _next_workday,
+    "week": _next_weekday,
+    "month": _next_month,
+}
+
+def _parse_datetime(value):
+    """
+    解析"YYYY-MM-DD HH:MM:SS"格式的时间字符串
+    优先使用比 strptime 快得多的 fromisoformat，不匹配时回退到 strptime
+    """
+    if len(value) == 19:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+@lru_cache(maxsize=256)
+def _parse_period(period):
+    """将period表达式按 _ 切分，返回(各片段, period片段的位置, 基础时间片段)"""
+    parts = tuple(period.split("_"))
+    period_index = parts.index("period") if "period" in parts else None
+    base_parts = parts[1:period_index] if period_index else parts[1:]
+    return parts, period_index, base_parts
+
+def calc_next_sync_datetime(period, last_sync_datetime=None, now=None):
     """
     根据周期计算下一次同步的日期时间
     
     参数:
         period: str, 周期表达式
         last_sync_datetime: str, 上次同步的日期字符串，格式为"YYYY-MM-DD HH:MM:SS"
+        now: datetime, 当前时间（可选），上次同步日期为空时作为基准，为空时取 datetime.now()
     返回:
         str: 下一次同步的时间字符串，格式为"YYYY-MM-DD HH:MM:SS"
     """
     try:
         # 解析上次同步日期
-        last_sync = datetime.now() if not last_sync_datetime else datetime.strptime(last_sync_datetime, "%Y-%m-%d %H:%M:%S")
+        if last_sync_datetime:
+            last_sync = _parse_datetime(last_sync_datetime)
+        else:
+            last_sync = now if now is not None else datetime.now()
     except ValueError:
         return ""
     
     # 直接时间格式处理
     if ' ' in period:
         try:
-            return datetime.strptime(period, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d %H:%M:%S")
+            return _parse_datetime(period).strftime("%Y-%m-%d %H:%M:%S")
         except ValueError:
             return ""
     
     # 解析period表达式
-    parts = period.split("_")
+    parts, period_index, base_parts = _parse_period(period)
     
     # period_xxx格式处理
     if parts[0] == "period":
         if len(parts) != 2:
             return ""
         try:
-            interval_type, interval_value = re.match(r'([a-zA-Z]+)(\d+)', parts[1]).groups()
-            next_sync = get_fixed_interval(last_sync, interval_type, int(interval_value))
+            interval_type, interval_value = _split_interval(parts[1])
+            next_sync = get_fixed_interval(last_sync, interval_type, interval_value)
             return next_sync.strftime("%Y-%m-%d %H:%M:%S")
-        except (ValueError, AttributeError):
+        except ValueError:
             return ""
     
     # every_xxx格式处理
     if parts[0] == "every":
         try:
-            # 检查是否包含period
-            period_index = next((i for i, part in enumerate(parts) if part == "period"), None)
-            base_parts = parts[1:period_index] if period_index else parts[1:]
-            
             # 解析基础时间
-            if base_parts[0] == "day":
-                hour, end_hour = parse_hour(base_parts[1])
-                next_sync = get_next_day_time(last_sync, hour, end_hour)
-            elif base_parts[0].startswith("day") and len(base_parts[0]) > 3:
-                # 处理格式：every_day6_6 (每隔6天6点)
-                days_interval = int(base_parts[0][3:])
-                hour, end_hour = parse_hour(base_parts[1])
-                next_sync = get_next_day_time(last_sync, hour, end_hour, days_interval)
-            
-            elif base_parts[0] == "WDay":
-                hour, end_hour = parse_hour(base_parts[1])
-                next_sync = get_next_workday_time(last_sync, hour, end_hour)
-            
-            elif base_parts[0].startswith("week"):
-                weekday = int(base_parts[0][4:])
-                hour, end_hour = parse_hour(base_parts[1])
-                next_sync = get_next_weekday_time(last_sync, weekday, hour, end_hour)
-            
-            elif base_parts[0].startswith("month"):
-                # 根据base_parts[0]的格式区分两种月份格式
-                if base_parts[0] == "month":
-                    # 格式：every_month_3_6
-                    if len(base_parts) < 3:
-                        return ""
-                    month = int(base_parts[1])
-                    hour, end_hour = parse_hour(base_parts[2])
-                    next_sync = get_next_month_time(last_sync, month, base_parts[1], hour, end_hour)
-                else:
-                    # 格式：every_month3_L_6
-                    if len(base_parts) < 3:
-                        return ""
-                    month = int(base_parts[0][5:])
-                    hour, end_hour = parse_hour(base_parts[2])
-                    next_sync = get_next_month_time(last_sync, month, base_parts[1], hour, end_hour)
-            
-            else:
+            name, tail = _split_token(base_parts[0])
+            handler = _EVERY_HANDLERS.get(name)
+            next_sync = handler(last_sync, tail, base_parts) if handler else None
+            if next_sync is None:
                 return ""
             
             # 处理period部分
             if period_index and len(parts) > period_index + 1:
-                interval_type, interval_value = re.match(r'([a-zA-Z]+)(\d+)', parts[period_index + 1]).groups()
-                interval_value = int(interval_value)
+                interval_type, interval_value = _split_interval(parts[period_index + 1])
                 
                 # 确保至少应用一次时间间隔，即使next_sync等于last_sync
                 if next_sync <= last_sync:
@@ -241,7 +289,7 @@ def calc_next_sync_datetime(period, last_sync_datetime=None):
             
             return next_sync.strftime("%Y-%m-%d %H:%M:%S")
             
-        except (ValueError, IndexError, AttributeError) as e:
+        except (ValueError, IndexError) as e:
             print(f"Error: {e}")  # 调试信息
             return ""
     